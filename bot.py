@@ -1,7 +1,10 @@
+import asyncio
 import logging
 import os
 import pathlib
-from typing import Any, ClassVar, Dict, List, NamedTuple, Optional
+import sys
+from time import perf_counter
+from typing import Any, Awaitable, ClassVar, Dict, List, Optional, Set, Tuple, TypeVar
 
 import aiohttp
 import asyncpg
@@ -10,17 +13,27 @@ from cachetools import TTLCache
 from discord.ext import commands
 
 from utils.context import AloneContext
-
-
-class TodoData(NamedTuple):
-    content: str
-    jump_url: str
+from utils.dispatch import MessageRouter
+from utils.help import HelpCatalog
+from utils.http import ConnectionStats, HTTPCache
+from utils.images import ImageCache
+from utils.members import MemberStats
+from utils.migrations import apply_migrations
+from utils.prefixes import PrefixIndex
+from utils.queries import QUERIES, QueryCatalog
+from utils.reporting import ErrorReporter
+from utils.source import SourceIndex
+from utils.todos import TodoCache
+from utils.views import DeleteButton
+from utils.writer import WriteBehindQueue
+
+T = TypeVar("T")
 
 
 class AloneBot(commands.Bot):
     INITIAL_EXTENSIONS: List[str] = []
     DEFAULT_PREFIXES: ClassVar[List[str]] = ["Alone", "alone"]
-    owner_ids: List[int]
+    owner_ids: Set[int]
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(
@@ -32,13 +45,18 @@ class AloneBot(commands.Bot):
             **kwargs,
         )
 
-        self.owner_ids = [412734157819609090]  # type: ignore
+        self.owner_ids = {412734157819609090}  # type: ignore
         self.blacklisted_users: Dict[int, str] = {}
         self.afk_users: Dict[int, str] = {}
-        self.todos: Dict[int, List[TodoData]] = {}
         self.user_prefixes: Dict[int, List[str]] = {}
         self.guild_prefixes: Dict[int, str] = {}
-        self.bot_messages_cache: TTLCache[discord.Message, discord.Message] = TTLCache(maxsize=2000, ttl=300.0)
+        self.prefix_index: PrefixIndex = PrefixIndex(self.DEFAULT_PREFIXES)
+        self.router: MessageRouter = MessageRouter(self)
+        self.help_catalog: HelpCatalog = HelpCatalog(self)
+        self.source_index: SourceIndex = SourceIndex()
+        self.member_stats: MemberStats = MemberStats()
+        # Invoking message ID -> (channel ID, response message ID), for edit re-runs and delete cascades.
+        self.bot_messages_cache: TTLCache[int, Tuple[int, int]] = TTLCache(maxsize=2000, ttl=300.0)
 
         self.cooldown: commands.CooldownMapping[discord.Message] = commands.CooldownMapping.from_cooldown(
             1, 1.5, commands.BucketType.member
@@ -47,42 +65,107 @@ class AloneBot(commands.Bot):
         self.emoji_guild: int = int(os.environ["emoji_guild"])
         self.EMOJIS: dict[str, discord.Emoji] = {}
         self.log_webhook: str = os.environ["webhook_url"]
+        self._log_webhook: Optional[discord.Webhook] = None
         self.github_link: str = os.environ["github"]
         self.maintenance: Optional[str] = None
 
         self.command_counter: int = 0
         self.launch_time = discord.utils.utcnow()
+        self.startup_timings: Dict[str, float] = {}
         self.jeyy_key = os.environ["jeyy_key"]
+        self.image_cache: ImageCache = ImageCache(
+            max_bytes=int(os.getenv("image_cache_size", 32 * 1024 * 1024)),
+            directory=os.getenv("image_cache_dir") or None,
+        )
 
     async def get_prefix(self, message: discord.Message, /) -> List[str] | str:
-        prefixes: List[str] = self.DEFAULT_PREFIXES.copy()
-        if user_prefixes := self.user_prefixes.get(message.author.id):
-            prefixes.extend(user_prefixes)
+        # Returning the exact matched slice lets the command view skip it as-is; an empty list rejects the message.
+        prefix: Optional[str] = self.match_prefix(message)
+        return [] if prefix is None else prefix
 
-        if message.guild and (guild_prefix := self.guild_prefixes.get(message.guild.id)):
-            prefixes.append(guild_prefix)
+    def match_prefix(self, message: discord.Message) -> Optional[str]:
+        return self.prefix_index.match(message.content, message.author.id, message.guild.id if message.guild else None)
 
-        return commands.when_mentioned_or(*prefixes)(self, message)
+    def prefixes_for(self, message: discord.Message) -> List[str]:
+        return self.prefix_index.prefixes_for(message.author.id, message.guild.id if message.guild else None)
+
+    async def on_message(self, message: discord.Message, /) -> None:
+        await self.router.dispatch(message)
 
     async def get_context(self, message: discord.Message, *, cls: Any = AloneContext) -> Any:
         return await super().get_context(message, cls=cls)
 
     async def setup_hook(self) -> None:
-        self.db: asyncpg.Pool[Any] | Any = await asyncpg.create_pool(
-            host=os.environ["database_ip"],
-            user=os.environ["database_user"],
-            password=os.environ["database_password"],
-            database=os.environ["database_name"],
+        started: float = perf_counter()
+        self.add_dynamic_items(DeleteButton)
+        self.reporter: ErrorReporter = ErrorReporter(self.get_log_webhook, logger=self.logger)
+        self.reporter.start()
+
+        # Nothing here depends on anything else, so the network waits overlap.
+        await asyncio.gather(
+            self._timed("emojis", self.load_emojis()),
+            self._timed("extensions", self.load_extensions()),
+            self._timed("database", self.setup_database()),
+        )
+
+        self.startup_timings["total"] = perf_counter() - started
+        report: str = ", ".join(f"{stage} {took * 1000:.0f}ms" for stage, took in self.startup_timings.items())
+        self.logger.info("Startup finished: %s", report)
+
+    async def _timed(self, stage: str, coro: Awaitable[T]) -> T:
+        start: float = perf_counter()
+        try:
+            return await coro
+        finally:
+            self.startup_timings[stage] = perf_counter() - start
+
+    async def setup_database(self) -> None:
+        host: str = os.environ["database_ip"]
+        user: str = os.environ["database_user"]
+        password: str = os.environ["database_password"]
+        database: str = os.environ["database_name"]
+
+        # Migrations run on their own connection before the pool opens, so no pooled connection caches statements
+        # against the old schema.
+        connection: asyncpg.Connection[Any] | Any = await asyncpg.connect(
+            host=host, user=user, password=password, database=database
+        )
+        try:
+            if applied := await self._timed("migrations", apply_migrations(connection)):
+                self.logger.info("Applied schema migrations %s", ", ".join(map(str, applied)))
+        finally:
+            await connection.close()
+
+        self.db: asyncpg.Pool[Any] | Any = await self._timed(
+            "database pool",
+            asyncpg.create_pool(
+                host=host,
+                user=user,
+                password=password,
+                database=database,
+                min_size=int(os.getenv("database_pool_min_size", 2)),
+                max_size=int(os.getenv("database_pool_max_size", 10)),
+                max_inactive_connection_lifetime=float(os.getenv("database_pool_idle_lifetime", 300.0)),
+                command_timeout=float(os.getenv("database_command_timeout", 10.0)),
+                # Never smaller than the catalog, so every named query stays prepared once per connection.
+                statement_cache_size=max(int(os.getenv("database_statement_cache_size", 100)), len(QUERIES)),
+            ),
         )
         if not self.db:
             raise RuntimeError("Couldn't connect to database!")
 
-        with open("schema.sql") as file:
-            await self.db.execute(file.read())
+        self.queries: QueryCatalog = QueryCatalog(self.db)
+        self.writer: WriteBehindQueue = WriteBehindQueue(self.queries, logger=self.logger)
+        self.writer.start()
+        self.todos: TodoCache = TodoCache(self.queries, self.writer, maxsize=int(os.getenv("todo_cache_size", 1000)))
+
+        await self._timed("preload", self.load_cache())
 
+    async def load_emojis(self) -> None:
         for emoji in (await self.fetch_guild(self.emoji_guild)).emojis:
             self.EMOJIS[emoji.name] = emoji
 
+    async def load_extensions(self) -> None:
         await self.load_extension("jishaku")
         for file in pathlib.Path("ext").glob("**/*.py"):
             *tree, _ = file.parts
@@ -96,21 +179,32 @@ class AloneBot(commands.Bot):
             else:
                 self.INITIAL_EXTENSIONS.append(f"{'.'.join(tree)}.{file.stem}")
 
-        records: list[Any]
-        records = await self.db.fetch("SELECT user_id, array_agg(prefix) AS prefixes FROM prefix GROUP BY user_id")
-        self.user_prefixes = {user_id: prefix for user_id, prefix in records}
+    async def load_cache(self) -> None:
+        "Loads the tables the bot keeps entirely in memory. To-do lists are loaded per user on demand."
+        prefix_records, guild_records, afk_records, blacklist_records = await asyncio.gather(
+            self.queries.fetch("prefix_all"),
+            self.queries.fetch("guild_prefix_all"),
+            self.queries.fetch("afk_all"),
+            self.queries.fetch("blacklist_all"),
+        )
+        # Prefixes and AFK reasons repeat a lot across users, so they're interned to share one copy of each.
+        self.user_prefixes = {user_id: [sys.intern(prefix) for prefix in prefixes] for user_id, prefixes in prefix_records}
+        self.guild_prefixes = {guild_id: sys.intern(prefix) for guild_id, prefix in guild_records if prefix}
 
-        records = await self.db.fetch("SELECT * FROM guilds")
-        self.guild_prefixes = {guild_id: prefix for guild_id, prefix in records}
+        self.afk_users = {user_id: sys.intern(reason) for user_id, reason in afk_records}
+        self.blacklisted_users = {user_id: reason for user_id, reason in blacklist_records}
 
-        records = await self.db.fetch("SELECT * FROM todo")
-        for user_id, content, jump_url in records:
-            self.todos.setdefault(user_id, []).append(TodoData(content, jump_url))
+        assert self.user
+        self.prefix_index.set_defaults([*self.DEFAULT_PREFIXES, f"<@{self.user.id}> ", f"<@!{self.user.id}> "])
+        for user_id, prefixes in self.user_prefixes.items():
+            self.prefix_index.update_user(user_id, prefixes)
 
-        records = await self.db.fetch("SELECT * FROM afk")
-        self.afk_users = {user_id: reason for user_id, reason in records}
+        for guild_id, prefix in self.guild_prefixes.items():
+            self.prefix_index.update_guild(guild_id, prefix)
 
     async def close(self) -> None:
+        await self.writer.close()
+        await self.reporter.close()
         await self.session.close()
         await self.db.close()
         await super().close()
@@ -118,11 +212,23 @@ class AloneBot(commands.Bot):
     async def start(self, token: str, *, reconnect: bool = True) -> None:
         discord.utils.setup_logging(handler=logging.FileHandler("bot.log"))
         self.logger: logging.Logger = logging.getLogger("discord")
-        self.session: aiohttp.ClientSession = aiohttp.ClientSession()
+        self.connection_stats: ConnectionStats = ConnectionStats()
+        # Every outbound API shares this session, so each host gets its own slice of the connection limit.
+        self.session: aiohttp.ClientSession = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=30),
+            timeout=aiohttp.ClientTimeout(total=30, connect=5, sock_read=20),
+            trace_configs=[self.connection_stats.trace_config()],
+        )
+        self.http_cache: HTTPCache = HTTPCache(self.session)
         await super().start(token)
 
     def get_log_webhook(self) -> discord.Webhook:
-        return discord.Webhook.from_url(self.log_webhook, session=self.session, bot_token=os.getenv("token"))
+        if not self._log_webhook:
+            self._log_webhook = discord.Webhook.from_url(
+                self.log_webhook, session=self.session, bot_token=os.getenv("token")
+            )
+
+        return self._log_webhook
 
     def is_blacklisted(self, user_id: int) -> bool:
         return user_id in self.blacklisted_users
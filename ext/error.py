@@ -57,19 +57,20 @@ class Error(commands.Cog):
             embed.description = "I couldn't find any subreddit with that name."
 
         else:
-            channel = self.bot.get_log_webhook()
             self.bot.logger.error("An error occurred", exc_info=error)
-            embed.title = f"Ignoring exception in {ctx.command}"
-            embed.description = f"```py\n{error}```\n"
-            embed.add_field(
-                name="Information",
-                value=f"Error Name: `{error.__class__.__name__}`\nMessage: `{ctx.message.content}`\nUser: {ctx.author.mention}",
+            report: discord.Embed = discord.Embed(
+                title=f"Ignoring exception in {ctx.command}",
+                description=f"```py\n{error}```\n",
+                color=discord.Color.red(),
             )
-
-            await channel.send(
-                f"This error came from {ctx.command} in {ctx.guild if ctx.guild else 'DMs'}.",
-                embed=embed,
+            report.set_author(name=f"{ctx.author.name}", icon_url=ctx.author.display_avatar)
+            report.add_field(
+                name="Information",
+                value=f"Error Name: `{error.__class__.__name__}`\nMessage: `{ctx.message.content}`\nUser: {ctx.author.mention}\n"
+                f"Source: {ctx.command} in {ctx.guild if ctx.guild else 'DMs'}",
             )
+            # Queued rather than sent here, so the reply below never waits on the webhook.
+            self.bot.reporter.report_error(error, report, command=ctx.command.qualified_name)
 
             embed.title = "Error"
             embed.description = "Sorry! An error ocurred and has been reported to the developers. Don't worry, this isn't your fault."
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, List
+from typing import TYPE_CHECKING, Dict, List, Set, Tuple
 
 import discord
+from cachetools import TTLCache
 from discord.ext import commands
 
 if TYPE_CHECKING:
@@ -10,13 +11,16 @@ if TYPE_CHECKING:
 
 
 class Events(commands.Cog):
+    MAX_REPLY_LENGTH: int = 2000
+
     def __init__(self, bot: AloneBot) -> None:
         self.bot: AloneBot = bot
+        # (channel ID, AFK user ID) pairs that were recently told about, so repeated pings stay quiet for a while.
+        self.afk_notices: TTLCache[Tuple[int, int], None] = TTLCache[Tuple[int, int], None](maxsize=4096, ttl=60.0)
 
     @commands.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild) -> None:
-        channel: Any = self.bot.get_log_webhook()
-        bots: int = sum(member.bot for member in guild.members)
+        bots: int = self.bot.member_stats.bots(guild)
 
         guild_metadata: list[str] = [
             f"Owner: {guild.owner}",
@@ -32,12 +36,12 @@ class Events(commands.Cog):
             color=0x5FAD68,
         )
 
-        await channel.send(embed=embed)
+        self.bot.reporter.report(embed)
 
     @commands.Cog.listener()
     async def on_guild_remove(self, guild: discord.Guild) -> None:
-        channel: Any = self.bot.get_log_webhook()
-        bots: int = sum(member.bot for member in guild.members)
+        bots: int = self.bot.member_stats.bots(guild)
+        self.bot.member_stats.forget(guild)
 
         guild_metadata: List[str] = [
             f"Owner: {guild.owner}",
@@ -53,54 +57,76 @@ class Events(commands.Cog):
             color=0xFF0000,
         )
 
-        await channel.send(embed=embed)
+        self.bot.reporter.report(embed)
 
     @commands.Cog.listener()
-    async def on_message(self, message: discord.Message) -> None:
-        if not self.bot.user:
-            # Asserting here will break as the client can receieve events before it has hit
-            # on_ready and cached the user.
-            return
+    async def on_guild_available(self, guild: discord.Guild) -> None:
+        # The member cache was rebuilt, so any count we had for it may have drifted.
+        self.bot.member_stats.forget(guild)
 
-        if message.content == f"<@{self.bot.user.id}>" and not message.author.bot:
-            await message.reply("Hello, I am Alone Bot, my prefix is alone.")
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member) -> None:
+        self.bot.member_stats.member_joined(member)
 
-    @commands.Cog.listener("on_message")
-    async def afk_check(self, message: discord.Message) -> None:
-        for mention in message.mentions:
-            if mention.id in self.bot.afk_users and not message.author.bot:
-                await message.reply(
-                    f"I'm sorry, but <@{mention.id}> went afk for {self.bot.afk_users[mention.id]}.",
-                    mention_author=False,
-                )
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member) -> None:
+        self.bot.member_stats.member_removed(member)
 
-        if message.author.id in self.bot.afk_users:
-            self.bot.afk_users.pop(message.author.id)
-            await self.bot.db.execute("DELETE FROM afk WHERE user_id = $1", message.author.id)
+    @commands.Cog.listener()
+    async def on_bot_mention(self, message: discord.Message) -> None:
+        await message.reply("Hello, I am Alone Bot, my prefix is alone.")
 
-            await message.reply(f"Welcome back {message.author.display_name}!", mention_author=False)
+    @commands.Cog.listener("on_afk_message")
+    async def afk_check(self, message: discord.Message) -> None:
+        afk_users: Dict[int, str] = self.bot.afk_users
+        lines: List[str] = []
+
+        if message.author.id in afk_users:
+            afk_users.pop(message.author.id)
+            self.bot.writer.enqueue("afk_remove", message.author.id)
+            lines.append(f"Welcome back {message.author.display_name}!")
+
+        length: int = sum(map(len, lines))
+        mentioned: Set[int] = afk_users.keys() & {user.id for user in message.mentions}
+        for index, user_id in enumerate(sorted(mentioned)):
+            key: Tuple[int, int] = (message.channel.id, user_id)
+            if key in self.afk_notices:
+                continue
+
+            line: str = f"I'm sorry, but <@{user_id}> went afk for {afk_users[user_id]}."
+            if length + len(line) + 1 > self.MAX_REPLY_LENGTH - 32:
+                lines.append(f"...and {len(mentioned) - index} more.")
+                break
+
+            self.afk_notices[key] = None
+            lines.append(line)
+            length += len(line) + 1
+
+        if lines:
+            await message.reply("\n".join(lines), mention_author=False)
+
+    async def delete_response(self, channel_id: int, message_id: int) -> None:
+        try:
+            await self.bot.get_partial_messageable(channel_id).get_partial_message(message_id).delete()
+        except discord.HTTPException:
+            pass
 
     @commands.Cog.listener()
     async def on_message_edit(self, before: discord.Message, after: discord.Message) -> None:
-        if not self.bot.bot_messages_cache.get(before):
-            return await self.bot.process_commands(after)
-
-        message: discord.Message | None = self.bot.bot_messages_cache.get(before)
+        # Embeds resolving also fire an edit, which shouldn't re-run the command.
+        if before.content == after.content:
+            return
 
-        if not after.content.startswith(tuple(await self.bot.get_prefix(before))):
-            self.bot.bot_messages_cache.pop(before)
-            if not message:
-                return
+        # The old response goes away either way: it's either stale, or about to be replaced by the re-run.
+        if response := self.bot.bot_messages_cache.pop(after.id, None):
+            await self.delete_response(*response)
 
-            await message.delete()
-        else:
-            await self.bot.process_commands(after)
+        await self.bot.process_commands(after)
 
     @commands.Cog.listener()
-    async def on_message_delete(self, message: discord.Message) -> None:
-        if self.bot.bot_messages_cache.get(message):
-            bot_message: discord.Message = self.bot.bot_messages_cache.pop(message)
-            await bot_message.delete()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
+        if response := self.bot.bot_messages_cache.pop(payload.message_id, None):
+            await self.delete_response(*response)
 
     @commands.Cog.listener()
     async def on_voice_state_update(
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import json
 import random
-from typing import TYPE_CHECKING, Any, Optional
+from collections import Counter, deque
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterable, List, NamedTuple, Optional, Tuple, cast
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from typing_extensions import LiteralString
 
 from utils import NoSubredditFound
@@ -14,33 +17,166 @@ if TYPE_CHECKING:
     from utils import AloneContext
 
 
+class RedditPost(NamedTuple):
+    title: str
+    url: str
+    over_18: bool
+
+
+LISTING_FIELDS: frozenset[str] = frozenset({"data", "children", "title", "url", "over_18"})
+NSFW_CHANNEL_TYPES = (discord.TextChannel, discord.VoiceChannel, discord.StageChannel, discord.Thread)
+
+
+def _listing_object(pairs: List[Tuple[str, Any]]) -> Any:
+    # Called for every JSON object as soon as it has been parsed, innermost first. Anything that isn't part of the
+    # listing -> children -> post path is dropped right away instead of being kept around as a dict.
+    fields: dict[str, Any] = {key: value for key, value in pairs if key in LISTING_FIELDS}
+    if "over_18" in fields and "title" in fields and "url" in fields:
+        return RedditPost(fields["title"], fields["url"], bool(fields["over_18"]))
+
+    if "children" in fields:
+        children: List[Any] = fields["children"]
+        return tuple(child for child in children if isinstance(child, RedditPost))
+
+    if isinstance(fields.get("data"), (RedditPost, tuple)):
+        return fields["data"]
+
+    return None
+
+
+def parse_listing(raw: str) -> Tuple[RedditPost, ...]:
+    "Parses a reddit listing into compact posts. Anything that isn't a listing parses to an empty tuple."
+    listing: Any = json.loads(raw, object_pairs_hook=_listing_object)
+    return cast(Tuple[RedditPost, ...], listing) if isinstance(listing, tuple) else ()
+
+
+def is_nsfw(channel: Any) -> bool:
+    "DMs and other channels without an NSFW setting count as SFW."
+    return isinstance(channel, NSFW_CHANNEL_TYPES) and channel.is_nsfw()
+
+
+class PostPool:
+    "Ready-to-send posts for one subreddit, split by NSFW flag so picking one never needs a network call."
+
+    def __init__(self, *, max_size: int = 50, max_age: float = 600.0) -> None:
+        self.max_size: int = max_size
+        self.max_age: float = max_age
+        self.sfw: Deque[Tuple[float, RedditPost]] = deque()
+        self.nsfw: Deque[Tuple[float, RedditPost]] = deque()
+        # Every url handed to the pool, so a cached listing never gives out the same post twice.
+        self._seen: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.sfw) + len(self.nsfw)
+
+    def refill(self, posts: Iterable[RedditPost]) -> None:
+        now: float = monotonic()
+        for post in posts:
+            if len(self) >= self.max_size:
+                break
+
+            if post.url in self._seen:
+                continue
+
+            self._seen[post.url] = now
+            (self.nsfw if post.over_18 else self.sfw).append((now, post))
+
+    def evict_stale(self) -> None:
+        cutoff: float = monotonic() - self.max_age
+        for posts in (self.sfw, self.nsfw):
+            while posts and posts[0][0] < cutoff:
+                posts.popleft()
+
+        self._seen = {url: added for url, added in self._seen.items() if added >= cutoff}
+
+    def pop(self, *, nsfw: bool) -> Optional[RedditPost]:
+        if nsfw and self.nsfw and (not self.sfw or self.nsfw[0][0] <= self.sfw[0][0]):
+            return self.nsfw.popleft()[1]
+
+        return self.sfw.popleft()[1] if self.sfw else None
+
+
 class Fun(commands.Cog):
+    POPULAR_SUBREDDITS: Tuple[str, ...] = ("dankmemes",)
+    LOW_WATER_MARK: int = 10
+
     def __init__(self, bot: AloneBot) -> None:
         self.bot: AloneBot = bot
+        self.post_pools: Dict[str, PostPool] = {}
+        self.subreddit_demand: Counter[str] = Counter()
+
+    async def cog_load(self) -> None:
+        self.refill_post_pools.start()
+
+    async def cog_unload(self) -> None:
+        self.refill_post_pools.cancel()
+
+    @tasks.loop(seconds=30)
+    async def refill_post_pools(self) -> None:
+        wanted: set[str] = {*self.POPULAR_SUBREDDITS, *(name for name, _ in self.subreddit_demand.most_common(5))}
+        self.subreddit_demand.clear()
+
+        for subreddit in list(self.post_pools):
+            pool: PostPool = self.post_pools[subreddit]
+            pool.evict_stale()
+            if subreddit not in wanted and not pool:
+                del self.post_pools[subreddit]
+
+        for subreddit in wanted:
+            pool = self.post_pools.setdefault(subreddit, PostPool())
+            if len(pool) >= self.LOW_WATER_MARK:
+                continue
 
-    async def fetch_subreddit(self, subreddit: str, sort: str = "hot") -> dict[str, Any]:
-        async with self.bot.session.get(f"https://old.reddit.com/r/{subreddit}/{sort}.json") as response:
-            data: Any = await response.json()
             try:
-                data["data"]
-            except KeyError:
-                raise NoSubredditFound("No subreddit by that name.")
+                pool.refill(await self.fetch_listing(subreddit))
+            except Exception as error:
+                self.bot.logger.warning("Couldn't refill the post pool for r/%s", subreddit, exc_info=error)
+
+    @refill_post_pools.before_loop
+    async def before_refill_post_pools(self) -> None:
+        await self.bot.wait_until_ready()
 
-        return random.choice(data["data"]["children"])["data"]
+    async def fetch_listing(self, subreddit: str, sort: str = "hot") -> Tuple[RedditPost, ...]:
+        posts: Tuple[RedditPost, ...] = await self.bot.http_cache.get_json(
+            f"https://old.reddit.com/r/{subreddit}/{sort}.json", endpoint="reddit", ttl=60, loads=parse_listing
+        )
+        if not posts:
+            raise NoSubredditFound("No subreddit by that name.")
+
+        return posts
+
+    async def next_post(self, subreddit: str, *, nsfw: bool) -> Optional[RedditPost]:
+        "Pops a prefetched post, only going to reddit when the pool for this subreddit is empty."
+        subreddit = subreddit.lower()
+        self.subreddit_demand[subreddit] += 1
+        pool: Optional[PostPool] = self.post_pools.get(subreddit)
+        if pool and (post := pool.pop(nsfw=nsfw)):
+            return post
+
+        posts: Tuple[RedditPost, ...] = await self.fetch_listing(subreddit)
+        pool = self.post_pools.setdefault(subreddit, PostPool())
+        pool.refill(posts)
+        if post := pool.pop(nsfw=nsfw):
+            return post
+
+        # Everything in the listing has been handed out already, so repeat a random one.
+        allowed: List[RedditPost] = [post for post in posts if nsfw or not post.over_18]
+        return random.choice(allowed) if allowed else None
 
     @commands.command(aliases=["define"])
     async def urban(self, ctx: AloneContext, *, word: Optional[str]) -> discord.Message | None:
         if not word:
             return await ctx.reply("You need to give me a word to look up!")
 
-        async with self.bot.session.get("https://api.urbandictionary.com/v0/define", params={"term": word}) as response:
-            data: Any = await response.json()
-            try:
-                word_info: Any = data["list"][0]
-            except IndexError:
-                return await ctx.reply("I couldn't find a definition for that word.")
-            else:
-                definition, name = word_info["definition"], word_info["word"]
+        data: Any = await self.bot.http_cache.get_json(
+            "https://api.urbandictionary.com/v0/define", endpoint="urban", params={"term": word}, ttl=600
+        )
+        try:
+            word_info: Any = data["list"][0]
+        except IndexError:
+            return await ctx.reply("I couldn't find a definition for that word.")
+        else:
+            definition, name = word_info["definition"], word_info["word"]
 
         await ctx.reply(embed=discord.Embed(title=name, description=definition))
 
@@ -51,18 +187,23 @@ class Fun(commands.Cog):
         await ctx.reply(embed=discord.Embed(title=f"{member}'s pp", description=f"8{pp}D\n({len(pp)}cm)"))
 
     @commands.command()
-    async def meme(self, ctx: AloneContext) -> None:
-        data: dict[str, Any] = await self.fetch_subreddit("dankmemes")
-        embed: discord.Embed = discord.Embed(title=data["title"], url=data["url"]).set_image(url=data["url"])
+    async def meme(self, ctx: AloneContext) -> discord.Message | None:
+        post: RedditPost | None = await self.next_post("dankmemes", nsfw=is_nsfw(ctx.channel))
+        if not post:
+            return await ctx.reply("This post is nsfw! I cannot send this in a normal channel!")
+
+        embed: discord.Embed = discord.Embed(title=post.title, url=post.url).set_image(url=post.url)
 
         await ctx.reply(embed=embed)
 
     @commands.command()
     async def waifu(self, ctx: AloneContext) -> None:
-        async with self.bot.session.get("https://api.waifu.im/search/", params={"included_tags": "waifu"}) as response:
-            hori: Any = await response.json()
-            image: Any = hori["images"][0]
-            waifu_url: Any = image["url"]
+        # Fetch a batch of images and pick one locally, so the cached response still gives a random waifu.
+        hori: Any = await self.bot.http_cache.get_json(
+            "https://api.waifu.im/search/", endpoint="waifu", params={"included_tags": "waifu", "many": "true"}, ttl=60
+        )
+        image: Any = random.choice(hori["images"])
+        waifu_url: Any = image["url"]
 
         embed: discord.Embed = discord.Embed(
             title=f"Here's your waifu, {ctx.author.name}",
@@ -77,13 +218,11 @@ class Fun(commands.Cog):
         if not subreddit:
             return await ctx.reply("You should give me a subreddit to search!")
 
-        data: dict[str, Any] = await self.fetch_subreddit(subreddit)
-        if not ctx.channel:
-            pass
-        elif data["over_18"] and not ctx.channel.is_nsfw():  # type: ignore
+        post: RedditPost | None = await self.next_post(subreddit, nsfw=is_nsfw(ctx.channel))
+        if not post:
             return await ctx.reply("This post is nsfw! I cannot send this in a normal channel!")
 
-        embed: discord.Embed = discord.Embed(title=data["title"], url=data["url"]).set_image(url=data["url"])
+        embed: discord.Embed = discord.Embed(title=post.title, url=post.url).set_image(url=post.url)
         await ctx.reply(embed=embed)
 
 
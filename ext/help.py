@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING, Any, List, Mapping, Optional, Tuple
 import discord
 from discord.ext import commands
 
-from utils import AloneContext, views
+from utils import AloneContext, CogHelp, views
 
 if TYPE_CHECKING:
     from bot import AloneBot
@@ -35,14 +35,8 @@ class _Help(commands.HelpCommand):
         )
 
         view: views.CogSelect = views.CogSelect(self.context)
-        for name, cog in self.context.bot.cogs.items():
-            if not await self.filter_commands(cog.get_commands(), sort=True):
-                continue
-
-            if not cog.get_commands():
-                continue
-
-            view.cog_select.append_option(discord.SelectOption(label=name))
+        for cog in await self.context.bot.help_catalog.visible_cogs(self):
+            view.cog_select.append_option(cog.option)
         view.cog_select.add_option(label="Close", description="Closes the help menu.")
         await self.context.reply(embed=embed, add_button_view=False, view=view)  # type: ignore
 
@@ -80,9 +74,10 @@ class _Help(commands.HelpCommand):
             description=cog.description,
             color=self.context.author.color,
         )
+        cog_help: CogHelp | None = self.context.bot.help_catalog.get(cog.qualified_name)
         embed.add_field(
             name="Commands",
-            value="\n".join([command.name for command in cog.get_commands()]),
+            value=cog_help.command_list if cog_help else "",
         )
         await self.context.reply(embed=embed)
 
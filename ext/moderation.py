@@ -1,15 +1,29 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Optional
+import re
+from typing import TYPE_CHECKING, Any, List, Optional
 
 import discord
 from discord.ext import commands
 
+from utils import CleanupEngine, CleanupFilter
+
 if TYPE_CHECKING:
     from bot import AloneBot
     from utils import AloneContext
 
 
+def no_users(ctx: commands.Context[Any]) -> List[discord.User]:
+    return []
+
+
+class PurgeFlags(commands.FlagConverter, case_insensitive=True):
+    limit: int = commands.flag(default=20, positional=True)
+    users: List[discord.User] = commands.flag(name="user", aliases=["from"], default=no_users)
+    match: Optional[str] = None
+    attachments: Optional[bool] = None
+
+
 class Moderation(commands.Cog):
     def __init__(self, bot: AloneBot) -> None:
         self.bot: AloneBot = bot
@@ -99,10 +113,28 @@ class Moderation(commands.Cog):
     @commands.command()
     @commands.bot_has_permissions(manage_messages=True)
     @commands.has_permissions(manage_messages=True)
-    async def purge(self, ctx: AloneContext, limit: int = 20) -> None:
+    async def purge(self, ctx: AloneContext, *, flags: PurgeFlags) -> None:
+        "Filters: `user:` (repeatable), `match:` (a regex), `attachments: yes/no`, e.g. `purge 50 user: @someone`"
+        try:
+            pattern: re.Pattern[str] | None = re.compile(flags.match, re.IGNORECASE) if flags.match else None
+        except re.error as error:
+            raise commands.BadArgument(f"That isn't a valid pattern: {error}")
+
+        check: CleanupFilter = CleanupFilter(
+            authors={user.id for user in flags.users} or None,
+            pattern=pattern,
+            attachments=flags.attachments,
+        )
+
         await ctx.message.delete()
-        messages: Any = await ctx.channel.purge(limit=limit)  # type: ignore
-        await ctx.send(f"{len(messages)} messages deleted.")
+        # Sent directly rather than as a tracked response, which deleting the invoking message would take down with it.
+        status: discord.Message = await ctx.channel.send("Deleting messages...")
+        await CleanupEngine(ctx.channel, bulk=True).run(
+            check,
+            limit=flags.limit,
+            before=ctx.message,
+            on_progress=lambda progress: status.edit(content=str(progress)),
+        )
 
 
 async def setup(bot: AloneBot) -> None:
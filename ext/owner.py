@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 import discord
 from discord.ext import commands
 
+from utils import store_usage
+
 if TYPE_CHECKING:
     from bot import AloneBot
     from utils import AloneContext
@@ -28,6 +30,65 @@ class Owner(commands.Cog):
 
         await ctx.message.add_reaction(ctx.emojis["tick"])
 
+    @commands.command()
+    async def routes(self, ctx: AloneContext) -> None:
+        router = self.bot.router
+        fmt: list[str] = [f"Messages: {router.total}"]
+        for route, count in router.counts.most_common():
+            share: float = count / router.total * 100 if router.total else 0.0
+            fmt.append(f"{route.name}: {count} ({share:.1f}%)")
+
+        await ctx.reply(embed=discord.Embed(title="Message routes", description="\n".join(fmt)))
+
+    @commands.command()
+    async def http(self, ctx: AloneContext) -> None:
+        fmt: list[str] = [f"{endpoint}: {stats}" for endpoint, stats in self.bot.http_cache.stats.items()]
+        embed: discord.Embed = discord.Embed(title="HTTP", description="\n".join(fmt) or "No requests yet.")
+
+        connections = self.bot.connection_stats
+        hosts: list[str] = [
+            f"{host}: {connections.active[host]} active, {connections.created[host]} opened, "
+            f"{connections.reuse_ratio(host):.0%} reused"
+            for host in sorted(connections.hosts())
+        ]
+        if hosts:
+            embed.add_field(name="Connections", value="\n".join(hosts))
+
+        await ctx.reply(embed=embed)
+
+    @commands.command()
+    async def queries(self, ctx: AloneContext) -> None:
+        timings = sorted(self.bot.queries.query_latency.items(), key=lambda item: item[1].count, reverse=True)
+        fmt: list[str] = [
+            f"{name}: {histogram.count} runs, {histogram.summary(50, 95)}" for name, histogram in timings if histogram.count
+        ]
+        await ctx.reply(embed=discord.Embed(title="Queries", description="\n".join(fmt) or "No queries yet."))
+
+    @commands.command()
+    async def memory(self, ctx: AloneContext) -> None:
+        stores: dict[str, Any] = {
+            "AFK": self.bot.afk_users,
+            "Todos (cached users)": self.bot.todos.lists,
+            "User prefixes": self.bot.user_prefixes,
+            "Guild prefixes": self.bot.guild_prefixes,
+            "Blacklist": self.bot.blacklisted_users,
+            "Response tracking": self.bot.bot_messages_cache,
+        }
+
+        fmt: list[str] = []
+        for name, store in stores.items():
+            entries, size = store_usage(store)
+            per_entry: str = f"{size / entries:.0f}B/entry" if entries else "empty"
+            fmt.append(f"{name}: {entries} entries, {size / 1024:.1f}KiB ({per_entry})")
+
+        images = self.bot.image_cache
+        fmt.append(
+            f"Image cache: {len(images)} entries, {images.size / 1024:.1f}KiB in memory "
+            f"({images.hits} hits, {images.disk_hits} disk hits, {images.misses} misses)"
+        )
+
+        await ctx.reply(embed=discord.Embed(title="Memory", description="\n".join(fmt)))
+
     @commands.group(invoke_without_command=True)
     async def blacklist(self, ctx: AloneContext) -> None:
         fmt: list[str] = []
@@ -49,14 +110,14 @@ class Owner(commands.Cog):
         reason: str = "No reason provided",
     ) -> None:
         self.bot.blacklisted_users[member.id] = reason
-        await self.bot.db.execute("INSERT INTO blacklist (user_id, reason) VALUES ($1, $2)", member.id, reason)
+        await self.bot.queries.execute("blacklist_add", member.id, reason)
         await ctx.message.add_reaction(ctx.emojis["tick"])
 
     @blacklist.command()
     async def remove(self, ctx: AloneContext, *, member: discord.Member) -> discord.Message | None:
         try:
             self.bot.blacklisted_users.pop(member.id)
-            await self.bot.db.execute("DELETE FROM blacklist WHERE user_id = $1", member.id)
+            await self.bot.queries.execute("blacklist_remove", member.id)
         except KeyError:
             await ctx.message.add_reaction(ctx.emojis["cross"])
             return await ctx.reply("That user isn't blacklisted!")
@@ -75,6 +136,7 @@ class Owner(commands.Cog):
             return await ctx.reply("This command is already disabled!")
 
         command.enabled = False
+        self.bot.help_catalog.invalidate()
         await ctx.reply(f"Disabled {name}.")
 
     @commands.command()
@@ -89,6 +151,7 @@ class Owner(commands.Cog):
             return await ctx.reply("This command is already enabled!")
 
         command.enabled = True
+        self.bot.help_catalog.invalidate()
         await ctx.reply(f"Enabled {name}.")
 
     @commands.command()
@@ -125,6 +188,8 @@ class Owner(commands.Cog):
     async def load(self, ctx: AloneContext, cog: str) -> None:
         try:
             await self.bot.load_extension(cog)
+            self.bot.help_catalog.invalidate()
+            self.bot.source_index.invalidate()
             message: str = "Loaded!"
         except Exception as error:
             message = f"Error! {error}"
@@ -134,6 +199,8 @@ class Owner(commands.Cog):
     async def unload(self, ctx: AloneContext, cog: str) -> None:
         try:
             await self.bot.unload_extension(cog)
+            self.bot.help_catalog.invalidate()
+            self.bot.source_index.invalidate()
             message: str = "Unloaded!"
         except Exception as error:
             message = f"Error! {error}"
@@ -152,6 +219,8 @@ class Owner(commands.Cog):
             cog_name = cog.split(".")[-1].capitalize()
             try:
                 await self.bot.reload_extension(cog)
+                self.bot.help_catalog.invalidate()
+                self.bot.source_index.invalidate()
             except commands.ExtensionNotLoaded:
                 cog_status += f"{ctx.emojis['cross']} {cog_name} not loaded!\n\n"
                 continue
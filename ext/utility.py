@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import inspect
+import sys
 from io import BytesIO
 from random import choice
 from time import perf_counter
@@ -9,8 +9,17 @@ from typing import TYPE_CHECKING, Any, List, LiteralString, Optional, Union
 import discord
 from discord.ext import commands
 
-from bot import TodoData
-from utils import GithubButton, InviteView, SourceButton, SupportView
+from utils import (
+    CleanupEngine,
+    CleanupFilter,
+    GithubButton,
+    InviteView,
+    SourceButton,
+    SourceEntry,
+    SupportView,
+    TodoData,
+    content_key,
+)
 
 if TYPE_CHECKING:
     from bot import AloneBot
@@ -22,14 +31,34 @@ async def create_codeblock(content: str) -> str:
     return f"{fmt}py\n{content}{fmt}"
 
 
+def parse_selection(selection: str, size: int) -> List[int]:
+    "Turns a selection like `1 3 5-7` into sorted, zero-based list indexes."
+    indexes: set[int] = set()
+    for part in selection.replace(",", " ").split():
+        start, _, end = part.partition("-")
+        try:
+            first, last = int(start), int(end or start)
+        except ValueError:
+            raise commands.BadArgument(f"{part} isn't a number or a range.")
+
+        if not 0 < first <= last <= size:
+            raise commands.BadArgument(f"{part} isn't in your todo list.")
+
+        indexes.update(range(first - 1, last))
+
+    return sorted(indexes)
+
+
 class Utility(commands.Cog):
+    SPOTIFY_PROGRESS_STEP: int = 10  # seconds
+
     def __init__(self, bot: AloneBot) -> None:
         self.bot: AloneBot = bot
 
     @commands.command()
     async def afk(self, ctx: AloneContext, *, reason: str = ".") -> None:
-        await self.bot.db.execute("INSERT INTO afk VALUES ($1, $2)", ctx.author.id, reason)
-        self.bot.afk_users[ctx.author.id] = reason
+        self.bot.afk_users[ctx.author.id] = sys.intern(reason)
+        self.bot.writer.enqueue("afk_set", ctx.author.id, reason)
         await ctx.message.add_reaction(ctx.emojis["tick"])
         await ctx.reply(f"**AFK**\nYou are now afk{f'for {reason}' if reason else ''}")
 
@@ -53,17 +82,13 @@ class Utility(commands.Cog):
 
     @commands.command()
     async def cleanup(self, ctx: AloneContext, limit: int = 50) -> None:
-        if not ctx.guild or isinstance(ctx.author, discord.User):
-            async for message in ctx.channel.history(limit=limit):
-                if message.author == ctx.me:
-                    await message.delete()
-            return await ctx.message.add_reaction(ctx.emojis["tick"])
-
-        bulk: bool = ctx.channel.permissions_for(ctx.guild.me).manage_messages
-        if ctx.channel.permissions_for(ctx.author).manage_messages:
-            limit = 100
+        bulk: bool = False
+        if ctx.guild and isinstance(ctx.author, discord.Member):
+            bulk = ctx.channel.permissions_for(ctx.guild.me).manage_messages
+            if ctx.channel.permissions_for(ctx.author).manage_messages:
+                limit = 100
 
-        await ctx.channel.purge(bulk=bulk, check=lambda m: m.author == ctx.me, limit=limit)  # type: ignore
+        await CleanupEngine(ctx.channel, bulk=bulk).run(CleanupFilter(authors={ctx.me.id}), limit=limit)
         await ctx.message.add_reaction(ctx.emojis["tick"])
 
     @commands.command()
@@ -92,10 +117,8 @@ class Utility(commands.Cog):
         end: float = perf_counter()
         typing_ping: float = (end - start) * 1000
 
-        start = perf_counter()
-        await self.bot.db.execute("SELECT 1")
-        end = perf_counter()
-        database_ping: float = (end - start) * 1000
+        queries = self.bot.queries
+        pool: dict[str, int] = queries.pool_stats()
 
         embed: discord.Embed = discord.Embed(title="Ping")
         embed.add_field(
@@ -108,14 +131,23 @@ class Utility(commands.Cog):
         )
         embed.add_field(
             name="<:postgresql:1180172627663396864> | Database",
-            value=await create_codeblock(f"{database_ping:.2f}ms"),
+            value=await create_codeblock(f"{queries.latency.summary()}\n{len(queries.latency)} recent queries"),
+            inline=False,
+        )
+        embed.add_field(
+            name="Pool",
+            value=await create_codeblock(
+                f"Acquire wait: {queries.acquire_wait.summary(50, 95)}\n"
+                f"Active: {pool['active']} | Idle: {pool['idle']} | Size: {pool['size']}/{pool['max']}"
+            ),
+            inline=False,
         )
 
         await message.edit(content=None, embed=embed)
 
     @commands.group(invoke_without_command=True)
     async def prefix(self, ctx: AloneContext) -> None:
-        prefix_list: str = "\n".join(await self.bot.get_prefix(ctx.message))
+        prefix_list: str = "\n".join(self.bot.prefixes_for(ctx.message))
         embed: discord.Embed = discord.Embed(title="Prefixes you can use", description=prefix_list)
         await ctx.reply(embed=embed)
 
@@ -125,9 +157,10 @@ class Utility(commands.Cog):
             return await ctx.reply("You can't have a prefix that's longer than 25 characters, sorry!")
 
         prefix_list: List[str] = self.bot.user_prefixes.setdefault(ctx.author.id, [])
-        prefix_list.append(prefix)
+        prefix_list.append(sys.intern(prefix))
+        self.bot.prefix_index.update_user(ctx.author.id, prefix_list)
 
-        await self.bot.db.execute("INSERT INTO prefix VALUES ($1, $2)", ctx.author.id, prefix)
+        self.bot.writer.enqueue("prefix_add", ctx.author.id, prefix)
         await ctx.message.add_reaction(ctx.emojis["tick"])
 
     @prefix.command(name="guild")
@@ -140,19 +173,18 @@ class Utility(commands.Cog):
             if not guild_config:
                 return await ctx.reply("There is no guild prefix to remove!")
 
-            await self.bot.db.execute("UPDATE guilds SET prefix = NULL WHERE guild_id = $1", ctx.guild.id)
+            self.bot.guild_prefixes.pop(ctx.guild.id)
+            self.bot.prefix_index.update_guild(ctx.guild.id, None)
+            self.bot.writer.enqueue("guild_prefix_clear", ctx.guild.id)
             await ctx.message.add_reaction(ctx.emojis["tick"])
             return await ctx.reply("The prefix for this guild has been removed.")
 
         if len(prefix) > 5:
             return await ctx.reply("You can't have a prefix that's longer than 5 characters, sorry!")
 
-        self.bot.guild_prefixes[ctx.guild.id] = prefix
-        await self.bot.db.execute(
-            "INSERT INTO guilds VALUES ($1, $2) ON CONFLICT DO UPDATE guilds SET prefix = $2 WHERE guild_id = $1",
-            ctx.guild.id,
-            prefix,
-        )
+        self.bot.guild_prefixes[ctx.guild.id] = sys.intern(prefix)
+        self.bot.prefix_index.update_guild(ctx.guild.id, prefix)
+        self.bot.writer.enqueue("guild_prefix_set", ctx.guild.id, prefix)
         await ctx.message.add_reaction(ctx.emojis["tick"])
         await ctx.reply(f"The prefix for this guild is now `{prefix}`")
 
@@ -164,16 +196,14 @@ class Utility(commands.Cog):
 
         if not prefix:
             self.bot.user_prefixes.pop(ctx.author.id)
-            await self.bot.db.execute("DELETE FROM prefix WHERE user_id = $1", ctx.author.id)
+            self.bot.prefix_index.update_user(ctx.author.id, None)
+            self.bot.writer.enqueue("prefix_clear", ctx.author.id)
             return await ctx.message.add_reaction(ctx.emojis["tick"])
 
         try:
             user_prefixes.remove(prefix)
-            await self.bot.db.execute(
-                "DELETE FROM prefix WHERE user_id = $1 AND prefix = $2",
-                ctx.author.id,
-                prefix,
-            )
+            self.bot.prefix_index.update_user(ctx.author.id, user_prefixes)
+            self.bot.writer.enqueue("prefix_remove", ctx.author.id, prefix)
             await ctx.message.add_reaction(ctx.emojis["tick"])
         except ValueError:
             await ctx.message.add_reaction(ctx.emojis["cross"])
@@ -183,7 +213,7 @@ class Utility(commands.Cog):
     @commands.guild_only()
     async def serverinfo(self, ctx: AloneContext, guild: discord.Guild = commands.CurrentGuild) -> None:
         assert guild.icon
-        bots: int = sum(member.bot for member in guild.members)
+        bots: int = self.bot.member_stats.bots(guild)
         embed: discord.Embed = discord.Embed(
             title=f"Server Info for {guild.name}",
             description=f"Owner: {guild.owner}\nID: {guild.id}\n"
@@ -201,14 +231,12 @@ class Utility(commands.Cog):
         if not command:
             return await ctx.reply("That command doesn't exist!")
 
-        source: str = inspect.getsource(command.callback)
-        source_lines: tuple[list[str], int] = inspect.getsourcelines(command.callback)
-        file_name: str | None = command.callback.__module__.replace(".", "/") + ".py"
+        source: SourceEntry = await self.bot.source_index.get(command)
         embed: discord.Embed = discord.Embed(
             title=f"Source for {command.name}",
-            description=await create_codeblock(source),
+            description=source.codeblock,
         )
-        await ctx.reply(embed=embed, view=SourceButton(ctx, source_lines, file_name))
+        await ctx.reply(embed=embed, view=SourceButton(ctx, source))
 
     @commands.command()
     async def spotify(self, ctx: AloneContext, *, member: discord.Member = commands.Author):
@@ -219,20 +247,29 @@ class Utility(commands.Cog):
         if not spotify:
             return await ctx.reply(f"{member.display_name} isn't listening to Spotify!")
 
-        headers: dict[str, str] = {"Authorization": f"Bearer {self.bot.jeyy_key}"}
-        params: dict[str, Any] = {
-            "title": spotify.title,
-            "cover_url": spotify.album_cover_url,
-            "duration_seconds": spotify.duration.seconds,
-            "start_timestamp": spotify.start.timestamp(),
-            "artists": spotify.artists,
-        }
-        async with self.bot.session.get(
-            "https://api.jeyy.xyz/v2/discord/spotify", params=params, headers=headers
-        ) as response:
-            bytes = BytesIO(await response.read())
-
-        file: discord.File = discord.File(bytes, "spotify.png")
+        # The card shows playback progress, so it's bucketed: everyone listening along shares one render per bucket.
+        bucket: int = int((discord.utils.utcnow() - spotify.start).total_seconds()) // self.SPOTIFY_PROGRESS_STEP
+        key: str = content_key(
+            spotify.title, tuple(spotify.artists), spotify.album_cover_url, spotify.duration.seconds, bucket
+        )
+
+        if not (file := self.bot.image_cache.file(key, "spotify.png")):
+            headers: dict[str, str] = {"Authorization": f"Bearer {self.bot.jeyy_key}"}
+            params: dict[str, Any] = {
+                "title": spotify.title,
+                "cover_url": spotify.album_cover_url,
+                "duration_seconds": spotify.duration.seconds,
+                # Fixed for the whole play, so overlapping requests share one download.
+                "start_timestamp": spotify.start.timestamp(),
+                "artists": spotify.artists,
+            }
+            image: bytes = await self.bot.http_cache.get_bytes(
+                "https://api.jeyy.xyz/v2/discord/spotify", endpoint="spotify", params=params, headers=headers
+            )
+            # Cached before the upload, so requests that come in while it's sending already hit.
+            await self.bot.image_cache.put(key, image)
+            file = discord.File(BytesIO(image), "spotify.png")
+
         artists: str = ", ".join(spotify.artists)
 
         embed: discord.Embed = discord.Embed(
@@ -256,13 +293,14 @@ class Utility(commands.Cog):
 
     @commands.group(invoke_without_command=True)
     async def todo(self, ctx: AloneContext) -> discord.Message | None:
-        user_todo: List[TodoData] | None = self.bot.todos.get(ctx.author.id)
+        user_todo: List[TodoData] = await self.bot.todos.get(ctx.author.id)
         if not user_todo:
             return await ctx.reply("You don't have a to-do list!")
 
         todo_list: str = ""
         for number, todo in enumerate(user_todo, start=1):
-            todo_list += f"**__[{number}]({todo.jump_url})__**: **{todo.content}**\n"
+            content: str = f"~~{todo.content}~~" if todo.done else todo.content
+            todo_list += f"**__[{number}]({todo.jump_url})__**: **{content}**\n"
 
         embed: discord.Embed = discord.Embed(title="Todo", description=todo_list)
         await ctx.reply(embed=embed)
@@ -270,41 +308,53 @@ class Utility(commands.Cog):
     @todo.command(name="add")
     async def todo_add(self, ctx: AloneContext, *, text: Optional[str]) -> None:
         assert text
-        task: TodoData = TodoData(text, ctx.message.jump_url)
-        user_todo: List[TodoData] = self.bot.todos.setdefault(ctx.author.id, [])
-        user_todo.append(task)
-
-        await self.bot.db.execute(
-            "INSERT INTO todo VALUES ($1, $2, $3)",
-            ctx.author.id,
-            text,
-            ctx.message.jump_url,
-        )
+        guild_id: int | None = ctx.guild.id if ctx.guild else None
+        # The invoking message's ID doubles as the to-do's ID, so adding one never waits on the database.
+        task: TodoData = TodoData(ctx.message.id, text, guild_id, ctx.channel.id, ctx.message.id)
+        await self.bot.todos.add(ctx.author.id, task)
         await ctx.message.add_reaction(ctx.emojis["tick"])
 
     @todo.command(name="remove")
-    async def todo_remove(self, ctx: AloneContext, todo_number: Optional[int]) -> discord.Message | None:
-        user_todo: List[TodoData] | None = self.bot.todos.get(ctx.author.id)
+    async def todo_remove(self, ctx: AloneContext, *, selection: Optional[str]) -> discord.Message | None:
+        "Remove to-dos by number or range, like `1 3 5-7`. Without a selection your whole list is removed."
+        user_todo: List[TodoData] = await self.bot.todos.get(ctx.author.id)
         if not user_todo:
             return await ctx.reply("You don't have a to-do list!")
 
-        if not todo_number:
-            self.bot.todos.pop(ctx.author.id)
-            await self.bot.db.execute("DELETE FROM todo WHERE user_id = $1", ctx.author.id)
+        if not selection:
+            self.bot.todos.clear(ctx.author.id)
             return await ctx.message.add_reaction(ctx.emojis["tick"])
 
-        for number, todo in enumerate(user_todo, start=1):
-            if todo_number == number:
-                try:
-                    user_todo.remove(todo)
-                    await self.bot.db.execute(
-                        "DELETE FROM todo WHERE user_id = $1 AND task = $2",
-                        ctx.author.id,
-                        todo.content,
-                    )
-                    await ctx.message.add_reaction(ctx.emojis["tick"])
-                except KeyError:
-                    await ctx.reply("That's not a task in your todo list!")
+        selected: List[TodoData] = [user_todo[index] for index in parse_selection(selection, len(user_todo))]
+        await self.bot.todos.remove(ctx.author.id, selected)
+        await ctx.message.add_reaction(ctx.emojis["tick"])
+
+    @todo.command(name="done")
+    async def todo_done(self, ctx: AloneContext, *, selection: str) -> discord.Message | None:
+        "Mark to-dos as done by number or range, like `1 3 5-7`."
+        user_todo: List[TodoData] = await self.bot.todos.get(ctx.author.id)
+        if not user_todo:
+            return await ctx.reply("You don't have a to-do list!")
+
+        self.bot.todos.mark_done([user_todo[index] for index in parse_selection(selection, len(user_todo))])
+        await ctx.message.add_reaction(ctx.emojis["tick"])
+
+    @todo.command(name="clear")
+    async def todo_clear(self, ctx: AloneContext) -> discord.Message | None:
+        "Removes every to-do that is marked as done."
+        if not await self.bot.todos.clear_done(ctx.author.id):
+            return await ctx.reply("You don't have any finished to-dos!")
+
+        await ctx.message.add_reaction(ctx.emojis["tick"])
+
+    @todo.command(name="move")
+    async def todo_move(self, ctx: AloneContext, number: int, position: int) -> discord.Message | None:
+        user_todo: List[TodoData] = await self.bot.todos.get(ctx.author.id)
+        if not 0 < number <= len(user_todo) or not 0 < position <= len(user_todo):
+            return await ctx.reply("That's not a task in your todo list!")
+
+        await self.bot.todos.move(ctx.author.id, number - 1, position - 1)
+        await ctx.message.add_reaction(ctx.emojis["tick"])
 
     @commands.command()
     async def uptime(self, ctx: AloneContext) -> None:
@@ -22,4 +22,4 @@ CREATE TABLE IF NOT EXISTS todo (
 CREATE TABLE IF NOT EXISTS blacklist (
     user_id BIGINT PRIMARY KEY,
     reason TEXT
-)
\ No newline at end of file
+);
@@ -0,0 +1,3 @@
+CREATE INDEX IF NOT EXISTS prefix_user_id_idx ON prefix (user_id);
+
+CREATE INDEX IF NOT EXISTS todo_user_id_idx ON todo (user_id);
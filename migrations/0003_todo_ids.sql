@@ -0,0 +1,17 @@
+ALTER TABLE todo ADD COLUMN IF NOT EXISTS id BIGSERIAL PRIMARY KEY;
+
+ALTER TABLE todo ADD COLUMN IF NOT EXISTS position BIGINT;
+
+ALTER TABLE todo ADD COLUMN IF NOT EXISTS done BOOLEAN NOT NULL DEFAULT FALSE;
+
+-- Existing rows keep their current order. New rows use their message snowflake as both
+-- id and position, which always sorts after these.
+UPDATE todo SET position = ordered.position
+FROM (SELECT id, row_number() OVER (PARTITION BY user_id ORDER BY id) AS position FROM todo) AS ordered
+WHERE todo.id = ordered.id AND todo.position IS NULL;
+
+ALTER TABLE todo ALTER COLUMN position SET NOT NULL;
+
+DROP INDEX IF EXISTS todo_user_id_idx;
+
+CREATE INDEX IF NOT EXISTS todo_user_id_position_idx ON todo (user_id, position);
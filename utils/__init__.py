@@ -1,3 +1,18 @@
+from .cleanup import *
 from .context import *
+from .dispatch import *
 from .errors import *
+from .help import *
+from .http import *
+from .images import *
+from .members import *
+from .memory import *
+from .metrics import *
+from .migrations import *
+from .prefixes import *
+from .queries import *
+from .reporting import *
+from .source import *
+from .todos import *
 from .views import *
+from .writer import *
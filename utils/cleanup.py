@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import re
+from time import monotonic
+from typing import Any, Awaitable, Callable, Collection, List, Optional
+
+import discord
+
+ProgressCallback = Callable[["CleanupProgress"], Awaitable[Any]]
+
+
+class RateBudget:
+    "Allows `rate` calls per `per` seconds, making callers wait for the next window instead of hitting a 429."
+
+    def __init__(self, rate: int, per: float) -> None:
+        self.rate: int = rate
+        self.per: float = per
+        self._window: float = 0.0
+        self._used: int = 0
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now: float = monotonic()
+            if now - self._window >= self.per:
+                self._window, self._used = now, 0
+
+            if self._used >= self.rate:
+                await asyncio.sleep(self._window + self.per - now)
+                self._window, self._used = monotonic(), 0
+
+            self._used += 1
+
+
+class CleanupFilter:
+    "Decides which messages a cleanup deletes. Unset filters match everything."
+
+    __slots__ = ("authors", "pattern", "attachments")
+
+    def __init__(
+        self,
+        *,
+        authors: Optional[Collection[int]] = None,
+        pattern: Optional[re.Pattern[str]] = None,
+        attachments: Optional[bool] = None,
+    ) -> None:
+        self.authors: Optional[Collection[int]] = authors
+        self.pattern: Optional[re.Pattern[str]] = pattern
+        self.attachments: Optional[bool] = attachments
+
+    def __call__(self, message: discord.Message) -> bool:
+        if self.authors is not None and message.author.id not in self.authors:
+            return False
+
+        if self.attachments is not None and bool(message.attachments) is not self.attachments:
+            return False
+
+        return not self.pattern or self.pattern.search(message.content) is not None
+
+
+class CleanupProgress:
+    __slots__ = ("scanned", "matched", "deleted", "failed", "finished")
+
+    def __init__(self) -> None:
+        self.scanned: int = 0
+        self.matched: int = 0
+        self.deleted: int = 0
+        self.failed: int = 0
+        self.finished: bool = False
+
+    def __str__(self) -> str:
+        status: str = "Done" if self.finished else "Deleting"
+        failed: str = f", {self.failed} failed" if self.failed else ""
+        return f"{status}: {self.deleted}/{self.matched} deleted ({self.scanned} scanned{failed})"
+
+
+class CleanupEngine:
+    "Deletes matching messages in one pass over history: recent ones in bulk, the rest singly, each within a rate budget."
+
+    BULK_SIZE: int = 100
+    # Bulk deletes reject anything older than 14 days; the margin covers messages that age out while we're queued.
+    BULK_MAX_AGE: datetime.timedelta = datetime.timedelta(days=14) - datetime.timedelta(minutes=5)
+
+    def __init__(
+        self,
+        channel: Any,
+        *,
+        bulk: bool,
+        bulk_budget: Optional[RateBudget] = None,
+        single_budget: Optional[RateBudget] = None,
+        progress_interval: float = 2.0,
+    ) -> None:
+        self.channel: Any = channel
+        self.bulk: bool = bulk
+        self.bulk_budget: RateBudget = bulk_budget or RateBudget(1, 1.0)
+        self.single_budget: RateBudget = single_budget or RateBudget(5, 5.0)
+        self.progress_interval: float = progress_interval
+
+    async def run(
+        self,
+        check: CleanupFilter,
+        *,
+        limit: int,
+        before: Optional[discord.abc.Snowflake] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> CleanupProgress:
+        progress: CleanupProgress = CleanupProgress()
+        reporter: Optional[asyncio.Task[None]] = None
+        if on_progress:
+            reporter = asyncio.create_task(self._report(progress, on_progress))
+
+        cutoff: datetime.datetime = discord.utils.utcnow() - self.BULK_MAX_AGE
+        deletes: List[asyncio.Task[None]] = []
+        chunk: List[discord.Message] = []
+        try:
+            async for message in self.channel.history(limit=limit, before=before):
+                progress.scanned += 1
+                if not check(message):
+                    continue
+
+                progress.matched += 1
+                if not self.bulk or message.created_at < cutoff:
+                    deletes.append(asyncio.create_task(self._delete_single(message, progress)))
+                    continue
+
+                chunk.append(message)
+                if len(chunk) == self.BULK_SIZE:
+                    deletes.append(asyncio.create_task(self._delete_bulk(chunk, progress)))
+                    chunk = []
+
+            if chunk:
+                deletes.append(asyncio.create_task(self._delete_bulk(chunk, progress)))
+
+            await asyncio.gather(*deletes)
+        finally:
+            progress.finished = True
+            if reporter:
+                reporter.cancel()
+
+        if on_progress:
+            await self._send_progress(progress, on_progress)
+
+        return progress
+
+    async def _report(self, progress: CleanupProgress, on_progress: ProgressCallback) -> None:
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            await self._send_progress(progress, on_progress)
+
+    async def _send_progress(self, progress: CleanupProgress, on_progress: ProgressCallback) -> None:
+        try:
+            await on_progress(progress)
+        except discord.HTTPException:
+            # Someone deleted the status message; the cleanup itself carries on.
+            pass
+
+    async def _delete_bulk(self, messages: List[discord.Message], progress: CleanupProgress) -> None:
+        await self.bulk_budget.acquire()
+        try:
+            await self.channel.delete_messages(messages)
+        except discord.HTTPException:
+            # Usually a message crossed the age limit; the single delete path sorts out which ones still exist.
+            await asyncio.gather(*(self._delete_single(message, progress) for message in messages))
+        else:
+            progress.deleted += len(messages)
+
+    async def _delete_single(self, message: discord.Message, progress: CleanupProgress) -> None:
+        await self.single_budget.acquire()
+        try:
+            await message.delete()
+        except discord.NotFound:
+            progress.deleted += 1
+        except discord.HTTPException:
+            progress.failed += 1
+        else:
+            progress.deleted += 1
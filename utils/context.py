@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING, Any
 import discord
 from discord.ext import commands
 
-from .views import DeleteView
+from .views import DeleteButton, delete_view
 
 if TYPE_CHECKING:
     from bot import AloneBot
@@ -31,14 +31,15 @@ class AloneContext(commands.Context["AloneBot"]):
             return await super().send(content, **kwargs)
 
         if add_button_view:
-            delete_button = DeleteView(self.author.id).children[0]
-            original_view = kwargs.get("view") or discord.ui.View()
-            if original_view:
-                original_view.add_item(delete_button)
-
-            kwargs["view"] = original_view
-
-        return await super().send(content, **kwargs)
+            if original_view := kwargs.get("view"):
+                original_view.add_item(DeleteButton(self.author.id))
+            else:
+                kwargs["view"] = delete_view(self.author.id)
+
+        message: discord.Message = await super().send(content, **kwargs)
+        # Only the first response is tracked, that's the one an edit or delete of the invoking message cascades to.
+        self.bot.bot_messages_cache.setdefault(self.message.id, (message.channel.id, message.id))
+        return message
 
     @property
     def emojis(self) -> dict[str, discord.Emoji]:
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import enum
+from collections import Counter
+from typing import TYPE_CHECKING, Optional
+
+import discord
+
+if TYPE_CHECKING:
+    from bot import AloneBot
+
+
+class MessageRoute(enum.Flag):
+    IGNORE = 0
+    COMMAND = enum.auto()
+    AFK = enum.auto()
+    GREETING = enum.auto()
+
+
+class MessageRouter:
+    "Sorts every gateway message once and only hands it to the handlers that care about it."
+
+    ROUTES: tuple[MessageRoute, ...] = (MessageRoute.COMMAND, MessageRoute.AFK, MessageRoute.GREETING)
+
+    def __init__(self, bot: AloneBot) -> None:
+        self.bot: AloneBot = bot
+        self.counts: Counter[MessageRoute] = Counter()
+        self.total: int = 0
+        self._greeting: Optional[str] = None
+
+    def classify(self, message: discord.Message) -> MessageRoute:
+        if message.author.bot:
+            return MessageRoute.IGNORE
+
+        route: MessageRoute = MessageRoute.IGNORE
+        if self.bot.match_prefix(message) is not None:
+            route |= MessageRoute.COMMAND
+
+        afk_users = self.bot.afk_users
+        if afk_users and (
+            message.author.id in afk_users or not afk_users.keys().isdisjoint(user.id for user in message.mentions)
+        ):
+            route |= MessageRoute.AFK
+
+        if self._greeting is None and self.bot.user:
+            self._greeting = f"<@{self.bot.user.id}>"
+
+        if message.content == self._greeting:
+            route |= MessageRoute.GREETING
+
+        return route
+
+    async def dispatch(self, message: discord.Message) -> None:
+        route: MessageRoute = self.classify(message)
+        self.total += 1
+        if not route:
+            self.counts[MessageRoute.IGNORE] += 1
+            return
+
+        for flag in self.ROUTES:
+            if flag in route:
+                self.counts[flag] += 1
+
+        if MessageRoute.AFK in route:
+            self.bot.dispatch("afk_message", message)
+
+        if MessageRoute.GREETING in route:
+            self.bot.dispatch("bot_mention", message)
+
+        if MessageRoute.COMMAND in route:
+            await self.bot.process_commands(message)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Optional, Tuple
+
+import discord
+from cachetools import LRUCache
+from discord.ext import commands
+
+if TYPE_CHECKING:
+    from bot import AloneBot
+
+
+def permission_key(ctx: commands.Context[Any]) -> Hashable:
+    "Everything the bot's command checks depend on, so contexts with the same key see the same commands."
+    author: Any = ctx.author
+    me: Any = ctx.me
+    return (
+        ctx.author.id in ctx.bot.owner_ids,
+        ctx.guild is not None,
+        ctx.permissions.value,
+        ctx.bot_permissions.value,
+        author.guild_permissions.value if isinstance(author, discord.Member) else None,
+        me.guild_permissions.value if isinstance(me, discord.Member) else None,
+    )
+
+
+class CogHelp:
+    "The pre-rendered help for one cog."
+
+    __slots__ = ("name", "commands", "command_list", "option", "_embed")
+
+    def __init__(self, cog: commands.Cog) -> None:
+        self.name: str = cog.qualified_name
+        self.commands: List[commands.Command[Any, ..., Any]] = cog.get_commands()
+        self.command_list: str = "\n".join(command.name for command in self.commands)
+        self.option: discord.SelectOption = discord.SelectOption(label=self.name)
+        self._embed: discord.Embed = discord.Embed(title=self.name, description=self.command_list)
+
+    def embed(self, color: discord.Colour | int | None = None) -> discord.Embed:
+        embed: discord.Embed = self._embed.copy()
+        embed.colour = color
+        return embed
+
+
+class HelpCatalog:
+    "Per-cog help built once per set of loaded extensions. Owner's load, reload and enable commands invalidate it."
+
+    def __init__(self, bot: AloneBot, *, maxsize: int = 512) -> None:
+        self.bot: AloneBot = bot
+        self._cogs: Optional[Dict[str, CogHelp]] = None
+        # (cog name, permission key) -> names of the commands that pass their checks.
+        self._visible: LRUCache[Tuple[str, Hashable], Tuple[str, ...]] = LRUCache(maxsize=maxsize)
+
+    @property
+    def cogs(self) -> Dict[str, CogHelp]:
+        if self._cogs is None:
+            self._cogs = {name: CogHelp(cog) for name, cog in self.bot.cogs.items() if cog.get_commands()}
+
+        return self._cogs
+
+    def get(self, name: str) -> Optional[CogHelp]:
+        return self.cogs.get(name)
+
+    def invalidate(self) -> None:
+        self._cogs = None
+        self._visible.clear()
+
+    async def visible(self, help_command: commands.HelpCommand, cog: CogHelp) -> Tuple[str, ...]:
+        "Names of the cog's commands the invoker can see, running the checks once per permission key."
+        key: Tuple[str, Hashable] = (cog.name, permission_key(help_command.context))
+        if (names := self._visible.get(key)) is None:
+            filtered = await help_command.filter_commands(cog.commands, sort=True)
+            names = self._visible[key] = tuple(command.name for command in filtered)
+
+        return names
+
+    async def visible_cogs(self, help_command: commands.HelpCommand) -> List[CogHelp]:
+        return [cog for cog in self.cogs.values() if await self.visible(help_command, cog)]
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import Counter
+from time import monotonic
+from typing import Any, Callable, Coroutine, Dict, Hashable, Mapping, Optional, Tuple, TypeVar
+
+import aiohttp
+import yarl
+from cachetools import LRUCache
+
+T = TypeVar("T")
+
+
+def request_key(method: str, url: str, params: Optional[Mapping[str, Any]] = None) -> Hashable:
+    if not params:
+        return (method, url, ())
+
+    # Lists (e.g. repeated query parameters) aren't hashable, so they're frozen into tuples.
+    frozen: list[tuple[str, Any]] = [
+        (key, tuple(value) if isinstance(value, list) else value) for key, value in params.items()  # type: ignore
+    ]
+    return (method, url, tuple(sorted(frozen)))
+
+
+class ConnectionStats:
+    "Counts new and reused connections and in-flight requests per host, fed by an aiohttp trace config."
+
+    def __init__(self) -> None:
+        self.created: Counter[str] = Counter()
+        self.reused: Counter[str] = Counter()
+        self.active: Counter[str] = Counter()
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        config: aiohttp.TraceConfig = aiohttp.TraceConfig()
+        config.on_request_start.append(self._on_request_start)
+        config.on_request_end.append(self._on_request_done)
+        config.on_request_exception.append(self._on_request_done)
+        config.on_connection_create_end.append(self._on_connection_created)
+        config.on_connection_reuseconn.append(self._on_connection_reused)
+        return config
+
+    def reuse_ratio(self, host: str) -> float:
+        total: int = self.created[host] + self.reused[host]
+        return self.reused[host] / total if total else 0.0
+
+    def hosts(self) -> set[str]:
+        return {*self.created, *self.reused}
+
+    async def _on_request_start(self, _: aiohttp.ClientSession, context: Any, params: Any) -> None:
+        context.host = params.url.host or ""
+        self.active[context.host] += 1
+
+    async def _on_request_done(self, _: aiohttp.ClientSession, context: Any, params: Any) -> None:
+        self.active[context.host] -= 1
+
+    async def _on_connection_created(self, _: aiohttp.ClientSession, context: Any, params: Any) -> None:
+        self.created[context.host] += 1
+
+    async def _on_connection_reused(self, _: aiohttp.ClientSession, context: Any, params: Any) -> None:
+        self.reused[context.host] += 1
+
+
+class EndpointStats:
+    __slots__ = ("hits", "misses", "coalesced")
+
+    def __init__(self) -> None:
+        self.hits: int = 0
+        self.misses: int = 0
+        self.coalesced: int = 0
+
+    def __str__(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses, {self.coalesced} coalesced"
+
+
+class SingleFlight:
+    "Runs one call per key at a time. Callers that arrive while it is in flight await the same result."
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, asyncio.Task[Any]] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Coroutine[Any, Any, T]]) -> Tuple[T, bool]:
+        "Returns the result and whether it was shared with a call that was already in flight."
+        task: Optional[asyncio.Task[Any]] = self._inflight.get(key)
+        shared: bool = task is not None
+        if not task:
+            task = asyncio.create_task(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shielded so one caller being cancelled doesn't cancel the call for everyone else.
+        return await asyncio.shield(task), shared
+
+
+class HTTPCache:
+    "A size-bounded LRU of JSON responses with a per-request TTL, with single-flight fetches for misses."
+
+    def __init__(self, session: aiohttp.ClientSession, *, maxsize: int = 256) -> None:
+        self.session: aiohttp.ClientSession = session
+        self.stats: Dict[str, EndpointStats] = {}
+        self._cache: LRUCache[Hashable, Tuple[float, Any]] = LRUCache(maxsize=maxsize)
+        self._flights: SingleFlight = SingleFlight()
+
+    def _stats(self, endpoint: Optional[str], url: str) -> EndpointStats:
+        name: str = endpoint or yarl.URL(url).host or url
+        if not (stats := self.stats.get(name)):
+            stats = self.stats[name] = EndpointStats()
+
+        return stats
+
+    async def get_json(
+        self,
+        url: str,
+        *,
+        ttl: float,
+        endpoint: Optional[str] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        loads: Callable[[str], Any] = json.loads,
+    ) -> Any:
+        "Returns the parsed body. Responses with an error status are returned but never cached."
+        stats: EndpointStats = self._stats(endpoint, url)
+        key: Hashable = request_key("GET", url, params)
+        entry: Optional[Tuple[float, Any]] = self._cache.get(key)
+        if entry and entry[0] > monotonic():
+            stats.hits += 1
+            return entry[1]
+
+        async def fetch() -> Any:
+            async with self.session.get(url, params=params, headers=headers) as response:
+                data: Any = await response.json(content_type=None, loads=loads)
+                if response.status < 400:
+                    self._cache[key] = (monotonic() + ttl, data)
+
+            return data
+
+        data, shared = await self._flights.do(key, fetch)
+        if shared:
+            stats.coalesced += 1
+        else:
+            stats.misses += 1
+
+        return data
+
+    async def get_bytes(
+        self,
+        url: str,
+        *,
+        endpoint: Optional[str] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> bytes:
+        "Uncached, but identical requests that overlap share a single download."
+        stats: EndpointStats = self._stats(endpoint, url)
+
+        async def fetch() -> bytes:
+            async with self.session.get(url, params=params, headers=headers) as response:
+                response.raise_for_status()
+                return await response.read()
+
+        data, shared = await self._flights.do(request_key("GET", url, params), fetch)
+        if shared:
+            stats.coalesced += 1
+        else:
+            stats.misses += 1
+
+        return data
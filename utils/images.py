@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+from io import BytesIO
+from typing import Callable, Hashable, List, Optional, Tuple, TypeVar
+
+import discord
+from cachetools import LRUCache
+
+V = TypeVar("V")
+
+
+def content_key(*parts: Hashable) -> str:
+    "A stable, filename-safe digest of everything that determines an image's content."
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+class _EvictingLRU(LRUCache[str, V]):
+    "An LRUCache that keeps what it evicts, so the owner can act on it afterwards."
+
+    def __init__(self, maxsize: int, getsizeof: Callable[[V], float]) -> None:
+        super().__init__(maxsize=maxsize, getsizeof=getsizeof)
+        self.evicted: List[Tuple[str, V]] = []
+
+    def popitem(self) -> Tuple[str, V]:
+        item: Tuple[str, V] = super().popitem()
+        self.evicted.append(item)
+        return item
+
+    def drain(self) -> List[Tuple[str, V]]:
+        evicted, self.evicted = self.evicted, []
+        return evicted
+
+
+def _file_size(size: int) -> float:
+    return size
+
+
+class ImageCache:
+    "Content-addressed LRU of rendered images under a byte budget. Evictions spill to a directory when one is set."
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = 32 * 1024 * 1024,
+        directory: Optional[str] = None,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.directory: Optional[str] = directory
+        self.hits: int = 0
+        self.disk_hits: int = 0
+        self.misses: int = 0
+
+        self._memory: _EvictingLRU[bytes] = _EvictingLRU(max_bytes, len)
+        # key -> file size; evicting a key here deletes its file.
+        self._disk: _EvictingLRU[int] = _EvictingLRU(max_disk_bytes, _file_size)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            entries: List[os.DirEntry[str]] = sorted(os.scandir(directory), key=lambda entry: entry.stat().st_mtime)
+            for entry in entries:
+                if entry.is_file() and not entry.name.endswith(".tmp") and entry.stat().st_size <= max_disk_bytes:
+                    self._disk[entry.name] = entry.stat().st_size
+
+            self._remove([key for key, _ in self._disk.drain()])
+
+    def __len__(self) -> int:
+        return len(self._memory) + len(self._disk)
+
+    @property
+    def size(self) -> int:
+        "Bytes held in memory."
+        return int(self._memory.currsize)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory or "", key)
+
+    def file(self, key: str, filename: str) -> Optional[discord.File]:
+        "Returns a ready-to-send file for a cached image, or None on a miss."
+        data: Optional[bytes] = self._memory.get(key)
+        if data is not None:
+            self.hits += 1
+            # BytesIO shares an immutable bytes buffer until it's written to, so this doesn't copy the image.
+            return discord.File(BytesIO(data), filename)
+
+        if self.directory and self._disk.get(key) is not None:
+            try:
+                file: discord.File = discord.File(self._path(key), filename)
+            except FileNotFoundError:
+                # Still being spilled, or removed from under us.
+                pass
+            else:
+                self.disk_hits += 1
+                return file
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, data: bytes) -> None:
+        if len(data) > self._memory.maxsize:
+            return
+
+        self._memory[key] = data
+        evicted: List[Tuple[str, bytes]] = self._memory.drain()
+        if not self.directory or not evicted:
+            return
+
+        for evicted_key, evicted_data in evicted:
+            if len(evicted_data) <= self._disk.maxsize:
+                self._disk[evicted_key] = len(evicted_data)
+
+        removed: List[str] = [key for key, _ in self._disk.drain()]
+        await asyncio.to_thread(self._spill, [item for item in evicted if item[0] in self._disk], removed)
+
+    def _spill(self, evicted: List[Tuple[str, bytes]], removed: List[str]) -> None:
+        for key, data in evicted:
+            # Written aside and renamed into place, so a concurrent read never sees a partial file.
+            with open(self._path(key) + ".tmp", "wb") as file:
+                file.write(data)
+            os.replace(self._path(key) + ".tmp", self._path(key))
+
+        self._remove(removed)
+
+    def _remove(self, keys: List[str]) -> None:
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Dict
+
+import discord
+
+
+class MemberStats:
+    "Per-guild bot counts, taken from the member cache once and then kept up to date from member events."
+
+    def __init__(self) -> None:
+        self._bots: Dict[int, int] = {}
+
+    def bots(self, guild: discord.Guild) -> int:
+        if (count := self._bots.get(guild.id)) is None:
+            count = self._bots[guild.id] = sum(member.bot for member in guild.members)
+
+        return count
+
+    def member_joined(self, member: discord.Member) -> None:
+        # Untracked guilds are counted in full on first use, which already includes this member.
+        if member.bot and member.guild.id in self._bots:
+            self._bots[member.guild.id] += 1
+
+    def member_removed(self, member: discord.Member) -> None:
+        if member.bot and member.guild.id in self._bots:
+            self._bots[member.guild.id] -= 1
+
+    def forget(self, guild: discord.Guild) -> None:
+        "Drops a guild's count, so it's recounted from the member cache the next time it's needed."
+        self._bots.pop(guild.id, None)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Iterable, Optional, Set, cast
+
+
+def deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    "Approximate bytes held by an object and everything it references, counting shared objects once."
+    seen = seen if seen is not None else set()
+    if id(obj) in seen:
+        return 0
+
+    seen.add(id(obj))
+    size: int = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return size
+
+    children: Iterable[Any] = ()
+    slots: Iterable[str] = getattr(type(cast(object, obj)), "__slots__", ())
+    if isinstance(obj, Mapping):
+        children = (item for pair in cast(Mapping[Any, Any], obj).items() for item in pair)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        children = cast(Iterable[Any], obj)
+    elif slots:
+        children = (getattr(obj, slot) for slot in slots if hasattr(obj, slot))
+    elif hasattr(obj, "__dict__"):
+        children = (obj.__dict__,)
+
+    return size + sum(deep_sizeof(child, seen) for child in children)
+
+
+def store_usage(store: Any) -> tuple[int, int]:
+    "Returns (entries, bytes) for an in-memory store."
+    return len(store), deep_sizeof(store)
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque
+
+
+class LatencyHistogram:
+    "Keeps the most recent samples, in seconds, and reports percentiles over them."
+
+    __slots__ = ("samples", "count")
+
+    def __init__(self, size: int = 1024) -> None:
+        self.samples: Deque[float] = deque(maxlen=size)
+        self.count: int = 0
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self, *percents: float) -> str:
+        "Formats the given percentiles in milliseconds, e.g. 'p50 1.20ms | p95 4.51ms'."
+        if not self.samples:
+            return "no samples"
+
+        ordered: list[float] = sorted(self.samples)
+        parts: list[str] = []
+        for percent in percents or (50, 95, 99):
+            index: int = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+            parts.append(f"p{percent:g} {ordered[index] * 1000:.2f}ms")
+
+        return " | ".join(parts)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import pathlib
+from typing import Any, List, Tuple
+
+import asyncpg
+
+MIGRATIONS_PATH: pathlib.Path = pathlib.Path("migrations")
+MIGRATION_LOCK: int = 0x416C6F6E65  # "Alone", so two instances never migrate at the same time.
+
+
+def discover_migrations(path: pathlib.Path = MIGRATIONS_PATH) -> List[Tuple[int, pathlib.Path]]:
+    "Migrations are named <version>_<name>.sql and applied in version order."
+    migrations: List[Tuple[int, pathlib.Path]] = []
+    for file in path.glob("*.sql"):
+        version, _, _ = file.stem.partition("_")
+        migrations.append((int(version), file))
+
+    return sorted(migrations)
+
+
+async def current_schema_version(connection: asyncpg.Connection[Any] | Any) -> int:
+    try:
+        return await connection.fetchval("SELECT max(version) FROM schema_version") or 0
+    except asyncpg.UndefinedTableError:
+        return 0
+
+
+async def apply_migrations(connection: asyncpg.Connection[Any] | Any, path: pathlib.Path = MIGRATIONS_PATH) -> List[int]:
+    "Applies pending migrations and returns their versions. A warm start costs a single version read."
+    migrations: List[Tuple[int, pathlib.Path]] = discover_migrations(path)
+    if not migrations or await current_schema_version(connection) >= migrations[-1][0]:
+        return []
+
+    applied: List[int] = []
+    async with connection.transaction():
+        await connection.execute("SELECT pg_advisory_xact_lock($1)", MIGRATION_LOCK)
+        await connection.execute(
+            "CREATE TABLE IF NOT EXISTS schema_version ("
+            "version INTEGER PRIMARY KEY, applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+        )
+
+        # Re-read under the lock in case another instance got here first.
+        current: int = await current_schema_version(connection)
+        for version, file in migrations:
+            if version <= current:
+                continue
+
+            await connection.execute(file.read_text())
+            await connection.execute("INSERT INTO schema_version (version) VALUES ($1)", version)
+            applied.append(version)
+
+    return applied
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern, Tuple
+
+
+class PrefixMatcher:
+    __slots__ = ("prefixes", "_initials", "_pattern", "_has_empty")
+
+    def __init__(self, prefixes: Iterable[str]) -> None:
+        unique: set[str] = set(prefixes)
+        self._has_empty: bool = "" in unique
+        unique.discard("")
+
+        # Longest first, so the regex alternation always picks the longest prefix that matches.
+        self.prefixes: Tuple[str, ...] = tuple(sorted(unique, key=lambda prefix: (-len(prefix), prefix)))
+        self._initials: FrozenSet[str] = frozenset(
+            char for prefix in self.prefixes for char in (prefix[0], prefix[0].lower(), prefix[0].upper())
+        )
+        self._pattern: Optional[Pattern[str]] = (
+            re.compile("|".join(map(re.escape, self.prefixes)), re.IGNORECASE) if self.prefixes else None
+        )
+
+    def match(self, content: str) -> Optional[str]:
+        "Returns the slice of content that matched a prefix, or None."
+        if content and self._pattern and content[0] in self._initials:
+            if match := self._pattern.match(content):
+                return match.group()
+
+        return "" if self._has_empty else None
+
+
+class PrefixIndex:
+    def __init__(self, defaults: Iterable[str]) -> None:
+        self.default: PrefixMatcher = PrefixMatcher(defaults)
+        self._users: Dict[int, PrefixMatcher] = {}
+        self._guilds: Dict[int, PrefixMatcher] = {}
+
+    def set_defaults(self, prefixes: Iterable[str]) -> None:
+        self.default = PrefixMatcher(prefixes)
+
+    def update_user(self, user_id: int, prefixes: Optional[Iterable[str]]) -> None:
+        if prefixes is None:
+            self._users.pop(user_id, None)
+            return
+
+        matcher: PrefixMatcher = PrefixMatcher(prefixes)
+        if matcher.prefixes or matcher.match("") is not None:
+            self._users[user_id] = matcher
+        else:
+            self._users.pop(user_id, None)
+
+    def update_guild(self, guild_id: int, prefix: Optional[str]) -> None:
+        if prefix:
+            self._guilds[guild_id] = PrefixMatcher((prefix,))
+        else:
+            self._guilds.pop(guild_id, None)
+
+    def match(self, content: str, user_id: int, guild_id: Optional[int]) -> Optional[str]:
+        "Case-insensitive longest-prefix match across the default, user and guild prefixes."
+        best: Optional[str] = self.default.match(content)
+
+        if (matcher := self._users.get(user_id)) and (found := matcher.match(content)) is not None:
+            if best is None or len(found) > len(best):
+                best = found
+
+        if guild_id and (matcher := self._guilds.get(guild_id)) and (found := matcher.match(content)) is not None:
+            if best is None or len(found) > len(best):
+                best = found
+
+        return best
+
+    def prefixes_for(self, user_id: int, guild_id: Optional[int]) -> List[str]:
+        prefixes: List[str] = list(self.default.prefixes)
+        if matcher := self._users.get(user_id):
+            prefixes.extend(matcher.prefixes)
+
+        if guild_id and (matcher := self._guilds.get(guild_id)):
+            prefixes.extend(matcher.prefixes)
+
+        return prefixes
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import contextlib
+from time import perf_counter
+from typing import Any, AsyncGenerator, Dict, Generator, Iterable, List, Sequence
+
+import asyncpg
+
+from .metrics import LatencyHistogram
+
+QUERIES: Dict[str, str] = {
+    # afk
+    "afk_all": "SELECT user_id, reason FROM afk",
+    "afk_set": "INSERT INTO afk VALUES ($1, $2) ON CONFLICT (user_id) DO UPDATE SET reason = EXCLUDED.reason",
+    "afk_remove": "DELETE FROM afk WHERE user_id = $1",
+    # blacklist
+    "blacklist_all": "SELECT user_id, reason FROM blacklist",
+    "blacklist_add": "INSERT INTO blacklist VALUES ($1, $2) ON CONFLICT (user_id) DO UPDATE SET reason = EXCLUDED.reason",
+    "blacklist_remove": "DELETE FROM blacklist WHERE user_id = $1",
+    # guilds
+    "guild_prefix_all": "SELECT guild_id, prefix FROM guilds",
+    "guild_prefix_set": "INSERT INTO guilds VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET prefix = EXCLUDED.prefix",
+    "guild_prefix_clear": "UPDATE guilds SET prefix = NULL WHERE guild_id = $1",
+    # prefix
+    "prefix_all": "SELECT user_id, array_agg(prefix) AS prefixes FROM prefix GROUP BY user_id",
+    "prefix_add": "INSERT INTO prefix VALUES ($1, $2)",
+    "prefix_remove": "DELETE FROM prefix WHERE user_id = $1 AND prefix = $2",
+    "prefix_clear": "DELETE FROM prefix WHERE user_id = $1",
+    # todo
+    "todo_user": "SELECT id, task, jump_url, done FROM todo WHERE user_id = $1 ORDER BY position",
+    "todo_add": (
+        "INSERT INTO todo (id, user_id, task, jump_url, position) VALUES ($1, $2, $3, $4, $1) "
+        "ON CONFLICT (id) DO UPDATE SET task = EXCLUDED.task"
+    ),
+    "todo_remove": "DELETE FROM todo WHERE id = ANY($1::BIGINT[])",
+    "todo_done": "UPDATE todo SET done = $2 WHERE id = ANY($1::BIGINT[])",
+    "todo_reorder": (
+        "UPDATE todo SET position = ordered.position "
+        "FROM unnest($1::BIGINT[]) WITH ORDINALITY AS ordered(id, position) WHERE todo.id = ordered.id"
+    ),
+    "todo_clear": "DELETE FROM todo WHERE user_id = $1",
+    "todo_clear_done": "DELETE FROM todo WHERE user_id = $1 AND done",
+}
+
+
+class QueryCatalog:
+    "Runs the named queries in QUERIES against the pool. asyncpg's per-connection statement cache prepares each once."
+
+    def __init__(self, pool: asyncpg.Pool[Any] | Any) -> None:
+        self.pool: asyncpg.Pool[Any] | Any = pool
+        self.acquire_wait: LatencyHistogram = LatencyHistogram()
+        self.latency: LatencyHistogram = LatencyHistogram()
+        self.query_latency: Dict[str, LatencyHistogram] = {name: LatencyHistogram(256) for name in QUERIES}
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncGenerator[Any, None]:
+        start: float = perf_counter()
+        async with self.pool.acquire() as connection:
+            self.acquire_wait.record(perf_counter() - start)
+            yield connection
+
+    @contextlib.contextmanager
+    def _timed(self, name: str) -> Generator[None, None, None]:
+        start: float = perf_counter()
+        try:
+            yield
+        finally:
+            took: float = perf_counter() - start
+            self.latency.record(took)
+            self.query_latency[name].record(took)
+
+    def pool_stats(self) -> Dict[str, int]:
+        size: int = self.pool.get_size()
+        idle: int = self.pool.get_idle_size()
+        return {"size": size, "active": size - idle, "idle": idle, "max": self.pool.get_max_size()}
+
+    async def execute(self, name: str, *args: Any, connection: Any = None) -> str:
+        if connection is None:
+            async with self.acquire() as connection:
+                return await self.execute(name, *args, connection=connection)
+
+        with self._timed(name):
+            return await connection.execute(QUERIES[name], *args)
+
+    async def executemany(self, name: str, args: Iterable[Sequence[Any]], *, connection: Any = None) -> None:
+        if connection is None:
+            async with self.acquire() as connection:
+                return await self.executemany(name, args, connection=connection)
+
+        with self._timed(name):
+            await connection.executemany(QUERIES[name], args)
+
+    async def fetch(self, name: str, *args: Any) -> List[asyncpg.Record]:
+        async with self.acquire() as connection:
+            with self._timed(name):
+                return await connection.fetch(QUERIES[name], *args)
+
+    async def fetchval(self, name: str, *args: Any) -> Any:
+        async with self.acquire() as connection:
+            with self._timed(name):
+                return await connection.fetchval(QUERIES[name], *args)
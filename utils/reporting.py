@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import pathlib
+import traceback
+from typing import Callable, Dict, Hashable, List, Optional
+
+import aiohttp
+import discord
+
+ROOT: str = str(pathlib.Path(__file__).resolve().parent.parent) + os.sep
+
+
+class Report:
+    __slots__ = ("embed", "count")
+
+    def __init__(self, embed: discord.Embed) -> None:
+        self.embed: discord.Embed = embed
+        self.count: int = 1
+
+
+def error_key(error: BaseException, command: Optional[str] = None) -> Hashable:
+    "Identifies an error by the command, its type and the deepest line of our own code it went through."
+    frames: List[traceback.FrameSummary] = [
+        frame for frame in traceback.extract_tb(error.__traceback__) if frame.filename.startswith(ROOT)
+    ]
+    if not frames:
+        return (command, type(error).__qualname__)
+
+    return (command, type(error).__qualname__, frames[-1].filename, frames[-1].lineno)
+
+
+class ErrorReporter:
+    "Sends log webhook reports in the background, folding repeats of the same error into a single embed."
+
+    MAX_EMBEDS: int = 10
+    MAX_CHARACTERS: int = 6000
+
+    def __init__(
+        self,
+        get_webhook: Callable[[], discord.Webhook],
+        *,
+        logger: logging.Logger,
+        interval: float = 5.0,
+        max_pending: int = 100,
+    ) -> None:
+        self.get_webhook: Callable[[], discord.Webhook] = get_webhook
+        self.logger: logging.Logger = logger
+        self.interval: float = interval
+        self.max_pending: int = max_pending
+        self.dropped: int = 0
+
+        self._pending: Dict[Hashable, Report] = {}
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+    def report(self, embed: discord.Embed, *, key: Optional[Hashable] = None) -> None:
+        "Queues an embed. Reports with the same key are counted instead of being sent again."
+        if key is not None and (existing := self._pending.get(key)):
+            existing.count += 1
+            return
+
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+
+        self._pending[key if key is not None else object()] = Report(embed)
+
+    def report_error(self, error: BaseException, embed: discord.Embed, *, command: Optional[str] = None) -> None:
+        self.report(embed, key=error_key(error, command))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.shield(self.flush())
+            except Exception as error:
+                self.logger.error("Couldn't flush log webhook reports", exc_info=error)
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+
+        reports: List[Report] = list(self._pending.values())
+        self._pending.clear()
+
+        batch: List[discord.Embed] = []
+        characters: int = 0
+        for report in reports:
+            embed: discord.Embed = report.embed
+            if report.count > 1:
+                embed.set_footer(text=f"Occurred {report.count} times")
+
+            if batch and (len(batch) >= self.MAX_EMBEDS or characters + len(embed) > self.MAX_CHARACTERS):
+                await self._send(batch)
+                batch, characters = [], 0
+
+            batch.append(embed)
+            characters += len(embed)
+
+        await self._send(batch)
+
+    async def _send(self, embeds: List[discord.Embed]) -> None:
+        content: str = discord.utils.MISSING
+        if self.dropped:
+            content, self.dropped = f"{self.dropped} reports were dropped because the queue was full.", 0
+
+        try:
+            await self.get_webhook().send(content, embeds=embeds)
+        except (discord.HTTPException, aiohttp.ClientError, OSError, asyncio.TimeoutError) as error:
+            self.logger.error("Couldn't send %d reports to the log webhook", len(embeds), exc_info=error)
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush()
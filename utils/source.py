@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+from typing import Any, Callable, Dict
+
+from discord.ext import commands
+
+from .http import SingleFlight
+
+
+class SourceEntry:
+    "A command's source, already fenced and cut down to fit an embed description."
+
+    __slots__ = ("codeblock", "file_name", "first_line", "line_count")
+
+    MAX_LENGTH: int = 4096
+
+    def __init__(self, source: str, file_name: str, first_line: int, line_count: int) -> None:
+        fence: str = "`" * 3
+        if len(source) + len(fence) * 2 + 3 > self.MAX_LENGTH:
+            cut: int = source.rfind("\n", 0, self.MAX_LENGTH - len(fence) * 2 - 7)
+            source = source[: cut + 1] + "...\n"
+
+        self.codeblock: str = f"{fence}py\n{source}{fence}"
+        self.file_name: str = file_name
+        self.first_line: int = first_line
+        self.line_count: int = line_count
+
+    @classmethod
+    def from_callback(cls, callback: Callable[..., Any]) -> SourceEntry:
+        lines, first_line = inspect.getsourcelines(callback)
+        return cls("".join(lines), callback.__module__.replace(".", "/") + ".py", first_line, len(lines))
+
+
+class SourceIndex:
+    "Command source by qualified name, read from disk once per command and kept until the extensions change."
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, SourceEntry] = {}
+        self._reads: SingleFlight = SingleFlight()
+
+    async def get(self, command: commands.Command[Any, ..., Any]) -> SourceEntry:
+        if entry := self._entries.get(command.qualified_name):
+            return entry
+
+        # Reading and tokenizing the module is file I/O, so it stays off the event loop.
+        entry, _ = await self._reads.do(
+            command.qualified_name, lambda: asyncio.to_thread(SourceEntry.from_callback, command.callback)
+        )
+        self._entries[command.qualified_name] = entry
+        return entry
+
+    def invalidate(self) -> None:
+        self._entries.clear()
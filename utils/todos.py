@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional
+
+from cachetools import LRUCache
+
+from .http import SingleFlight
+from .queries import QueryCatalog
+from .writer import WriteBehindQueue
+
+
+class TodoData:
+    "A to-do entry. The jump URL is stored as its three IDs and only built when it's shown."
+
+    __slots__ = ("id", "content", "guild_id", "channel_id", "message_id", "done")
+
+    def __init__(
+        self,
+        id: int,
+        content: str,
+        guild_id: Optional[int],
+        channel_id: int,
+        message_id: int,
+        done: bool = False,
+    ) -> None:
+        self.id: int = id
+        self.content: str = content
+        self.guild_id: Optional[int] = guild_id
+        self.channel_id: int = channel_id
+        self.message_id: int = message_id
+        self.done: bool = done
+
+    @classmethod
+    def from_jump_url(cls, id: int, content: str, jump_url: str, done: bool = False) -> TodoData:
+        guild_id, channel_id, message_id = jump_url.rsplit("/", 3)[-3:]
+        return cls(id, content, None if guild_id == "@me" else int(guild_id), int(channel_id), int(message_id), done)
+
+    @property
+    def jump_url(self) -> str:
+        return f"https://discord.com/channels/{self.guild_id or '@me'}/{self.channel_id}/{self.message_id}"
+
+
+class TodoCache:
+    "Read-through LRU of per-user to-do lists. Lists load on first access and every change is written through."
+
+    def __init__(self, queries: QueryCatalog, writer: WriteBehindQueue, *, maxsize: int = 1000) -> None:
+        self.queries: QueryCatalog = queries
+        self.writer: WriteBehindQueue = writer
+        # user ID -> to-do ID -> to-do, in position order, so adding and removing by ID are lookups.
+        self.lists: LRUCache[int, Dict[int, TodoData]] = LRUCache(maxsize=maxsize)
+        self._loads: SingleFlight = SingleFlight()
+
+    async def _entries(self, user_id: int) -> Dict[int, TodoData]:
+        if (todos := self.lists.get(user_id)) is not None:
+            return todos
+
+        todos, _ = await self._loads.do(user_id, lambda: self._load(user_id))
+        return todos
+
+    async def get(self, user_id: int) -> List[TodoData]:
+        "Returns the user's list in position order."
+        return list((await self._entries(user_id)).values())
+
+    async def _load(self, user_id: int) -> Dict[int, TodoData]:
+        # Writes for an evicted user may still be queued or mid-flush, and the database has to see them before we read
+        # it back. Flushing takes the writer's lock, so it also waits for a background flush that is already running.
+        await self.writer.flush()
+
+        records = await self.queries.fetch("todo_user", user_id)
+        todos: Dict[int, TodoData] = {
+            id: TodoData.from_jump_url(id, task, jump_url, done) for id, task, jump_url, done in records
+        }
+        self.lists[user_id] = todos
+        return todos
+
+    async def add(self, user_id: int, todo: TodoData) -> None:
+        "Appends a to-do. Adding one with an existing ID (an edited command) replaces its text."
+        todos: Dict[int, TodoData] = await self._entries(user_id)
+        if existing := todos.get(todo.id):
+            existing.content = todo.content
+        else:
+            todos[todo.id] = todo
+
+        self.writer.enqueue("todo_add", todo.id, user_id, todo.content, todo.jump_url)
+
+    async def remove(self, user_id: int, selected: Iterable[TodoData]) -> None:
+        todos: Dict[int, TodoData] = await self._entries(user_id)
+        ids: List[int] = [todo.id for todo in selected]
+        for id in ids:
+            todos.pop(id, None)
+
+        self.writer.enqueue("todo_remove", ids)
+
+    def mark_done(self, selected: Iterable[TodoData], done: bool = True) -> None:
+        ids: List[int] = []
+        for todo in selected:
+            todo.done = done
+            ids.append(todo.id)
+
+        self.writer.enqueue("todo_done", ids, done)
+
+    async def move(self, user_id: int, old_index: int, new_index: int) -> None:
+        ordered: List[TodoData] = await self.get(user_id)
+        ordered.insert(new_index, ordered.pop(old_index))
+        self.lists[user_id] = {todo.id: todo for todo in ordered}
+        self.writer.enqueue("todo_reorder", [todo.id for todo in ordered])
+
+    def clear(self, user_id: int) -> None:
+        self.lists[user_id] = {}
+        self.writer.enqueue("todo_clear", user_id)
+
+    async def clear_done(self, user_id: int) -> int:
+        todos: Dict[int, TodoData] = await self._entries(user_id)
+        remaining: Dict[int, TodoData] = {id: todo for id, todo in todos.items() if not todo.done}
+        self.lists[user_id] = remaining
+        self.writer.enqueue("todo_clear_done", user_id)
+        return len(todos) - len(remaining)
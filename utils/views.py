@@ -1,27 +1,37 @@
 from __future__ import annotations
 
+import functools
+import re
 from typing import TYPE_CHECKING, Any
 
 import discord
-from discord.ext import commands
 
 if TYPE_CHECKING:
     from bot import AloneBot
     from utils.context import AloneContext
+    from utils.help import CogHelp
+    from utils.source import SourceEntry
 
 
-class DeleteView(discord.ui.View):
+class DeleteButton(discord.ui.DynamicItem[discord.ui.Button[Any]], template=r"delete:(?P<author_id>[0-9]+)"):
     def __init__(self, author_id: int) -> None:
-        super().__init__(timeout=None)
+        super().__init__(
+            discord.ui.Button(
+                emoji="\U0001f5d1",
+                style=discord.ButtonStyle.danger,
+                label="Delete",
+                custom_id=f"delete:{author_id}",
+            )
+        )
         self.author_id: int = author_id
 
-    @discord.ui.button(
-        emoji="\U0001f5d1",
-        style=discord.ButtonStyle.danger,
-        label="Delete",
-        custom_id="delete",
-    )
-    async def delete(self, interaction: discord.Interaction, _) -> None:
+    @classmethod
+    async def from_custom_id(
+        cls, interaction: discord.Interaction, item: discord.ui.Button[Any], match: re.Match[str], /
+    ) -> DeleteButton:
+        return cls(int(match["author_id"]))
+
+    async def callback(self, interaction: discord.Interaction) -> None:
         if interaction.user.id == self.author_id:
             if not interaction.message:
                 return
@@ -34,6 +44,21 @@ class DeleteView(discord.ui.View):
         )
 
 
+class DeleteView(discord.ui.View):
+    "Carries the delete button for replies. Clicks are routed through the DeleteButton registered at startup."
+
+    def __init__(self, author_id: int) -> None:
+        super().__init__(timeout=None)
+        self.add_item(DeleteButton(author_id))
+        # A finished view is still rendered, but never kept in the view store.
+        self.stop()
+
+
+@functools.lru_cache(maxsize=1024)
+def delete_view(author_id: int) -> DeleteView:
+    return DeleteView(author_id)
+
+
 class SupportView(discord.ui.View):
     def __init__(self, support_url: str) -> None:
         super().__init__(timeout=None)
@@ -54,19 +79,14 @@ class GithubButton(discord.ui.View):
 
 
 class SourceButton(discord.ui.View):
-    def __init__(
-        self,
-        ctx: AloneContext,
-        source_lines: tuple[list[str], int],
-        file_name: str | None,
-    ) -> None:
+    def __init__(self, ctx: AloneContext, source: SourceEntry) -> None:
         super().__init__(timeout=None)
         self.ctx: AloneContext = ctx
         self.add_item(
             discord.ui.Button(
                 emoji="<:github:1019435755979935794>",
                 label="Source",
-                url=f"{self.ctx.bot.github_link}/tree/master/{file_name}#L{source_lines[1]}-L{len(source_lines[0])+source_lines[1]}",
+                url=f"{self.ctx.bot.github_link}/tree/master/{source.file_name}#L{source.first_line}-L{source.line_count+source.first_line}",
             )
         )
 
@@ -97,21 +117,13 @@ class CogSelect(discord.ui.View):
 
             return await interaction.message.delete()
 
-        cog: commands.Cog | None = interaction.client.get_cog(select.values[0])
+        cog: CogHelp | None = interaction.client.help_catalog.get(select.values[0])
         if not cog:
             return await interaction.followup.send(
                 "Somehow, this cog doesn't exist. Please report this in my support server."
             )
 
-        command_list: str = ""
-        for command in cog.get_commands():
-            command_list += f"{command.name}\n"
-
-        embed: discord.Embed = discord.Embed(
-            title=cog.qualified_name,
-            description=command_list,
-            color=interaction.user.color,
-        )
+        embed: discord.Embed = cog.embed(interaction.user.color)
         await interaction.response.edit_message(embed=embed)
 
 
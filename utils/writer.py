@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, List, Optional, Tuple
+
+import asyncpg
+
+from .queries import QueryCatalog
+
+# Errors that mean the database couldn't be reached, as opposed to a statement being rejected.
+CONNECTION_ERRORS: Tuple[type[BaseException], ...] = (OSError, asyncio.TimeoutError, asyncpg.PostgresConnectionError)
+
+
+class WriteBatch:
+    "Consecutive writes of the same statement, and how many flushes have already failed to reach the database with them."
+
+    __slots__ = ("name", "args", "attempts")
+
+    def __init__(self, name: str, args: List[Tuple[Any, ...]], attempts: int = 0) -> None:
+        self.name: str = name
+        self.args: List[Tuple[Any, ...]] = args
+        self.attempts: int = attempts
+
+
+class WriteBehindQueue:
+    "Queues catalog writes and flushes them in order, batching consecutive runs of the same statement."
+
+    def __init__(
+        self,
+        queries: QueryCatalog,
+        *,
+        logger: logging.Logger,
+        interval: float = 1.0,
+        max_pending: int = 100,
+        max_attempts: int = 60,
+    ) -> None:
+        self.queries: QueryCatalog = queries
+        self.logger: logging.Logger = logger
+        self.interval: float = interval
+        self.max_pending: int = max_pending
+        self.max_attempts: int = max_attempts
+        self.flushed: int = 0
+        self.dropped: int = 0
+
+        self._pending: List[WriteBatch] = []
+        self._size: int = 0
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._lock: asyncio.Lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def start(self) -> None:
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+    def enqueue(self, name: str, *args: Any) -> None:
+        # Requeued batches aren't extended, so new writes don't inherit their failed attempts.
+        if self._pending and self._pending[-1].name == name and not self._pending[-1].attempts:
+            self._pending[-1].args.append(args)
+        else:
+            self._pending.append(WriteBatch(name, [args]))
+
+        self._size += 1
+        if self._size >= self.max_pending:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._wakeup.clear()
+            try:
+                # Shielded so that cancelling the loop on close never drops a batch that is mid-write.
+                await asyncio.shield(self.flush())
+            except Exception as error:
+                self.logger.error("Write-behind flush failed", exc_info=error)
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._pending:
+                return
+
+            batches, self._pending, self._size = self._pending, [], 0
+            try:
+                async with self.queries.acquire() as connection, connection.transaction():
+                    for batch in batches:
+                        await self.queries.executemany(batch.name, batch.args, connection=connection)
+            except CONNECTION_ERRORS as error:
+                self.logger.error("Database unreachable, keeping writes queued", exc_info=error)
+                self._requeue(batches)
+            except Exception as error:
+                self.logger.error("Batched write failed, retrying statements one by one", exc_info=error)
+                await self._flush_individually(batches)
+            else:
+                self.flushed += sum(len(batch.args) for batch in batches)
+
+    def _requeue(self, batches: List[WriteBatch]) -> None:
+        "Puts unwritten batches back in front of anything queued since, so they're retried first and in order."
+        requeued: List[WriteBatch] = []
+        for batch in batches:
+            if not batch.args:
+                continue
+
+            batch.attempts += 1
+            if batch.attempts > self.max_attempts:
+                self.dropped += len(batch.args)
+                self.logger.error(
+                    "Dropping %d %s writes after %d failed attempts", len(batch.args), batch.name, batch.attempts
+                )
+            else:
+                requeued.append(batch)
+
+        self._pending[:0] = requeued
+        self._size += sum(len(batch.args) for batch in requeued)
+
+    async def _flush_individually(self, batches: List[WriteBatch]) -> None:
+        index, position = 0, 0
+        try:
+            async with self.queries.acquire() as connection:
+                for index, batch in enumerate(batches):
+                    for position, args in enumerate(batch.args):
+                        try:
+                            await self.queries.execute(batch.name, *args, connection=connection)
+                        except CONNECTION_ERRORS:
+                            raise
+                        except Exception as error:
+                            self.dropped += 1
+                            self.logger.error("Dropping write %s %r", batch.name, args, exc_info=error)
+                        else:
+                            self.flushed += 1
+
+                index, position = len(batches), 0
+        except CONNECTION_ERRORS as error:
+            self.logger.error("Database unreachable, keeping writes queued", exc_info=error)
+            if index < len(batches):
+                current: WriteBatch = batches[index]
+                self._requeue([WriteBatch(current.name, current.args[position:], current.attempts), *batches[index + 1 :]])
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush()